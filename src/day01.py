@@ -1,42 +1,153 @@
-from pathlib import Path
+from collections.abc import Buffer, Iterator
 
+import numpy as np
+from numpy.typing import NDArray
 
-def do_floor(s: str) -> int:
+from utils.file_utils import map_raw_file, read_raw_file
+from utils.registry import solution
+
+CHUNK_SIZE = 1 << 22
+BLOCK_SIZE = 1024
+
+# Floor change for every byte value: ( is up, ) is down, anything else stays put
+STEPS = np.zeros(256, dtype=np.int8)
+STEPS[ord("(")] = 1
+STEPS[ord(")")] = -1
+
+
+def _as_array(s: str | Buffer) -> NDArray[np.uint8]:
+    """The instructions as a byte array, without copying buffers"""
+    return np.frombuffer(s.encode() if isinstance(s, str) else s, dtype=np.uint8)
+
+
+def _chunks(s: str | Buffer, chunk_size: int) -> Iterator[NDArray[np.uint8]]:
+    data = _as_array(s)
+    for start in range(0, len(data), chunk_size):
+        yield data[start : start + chunk_size]
+
+
+def do_floor(s: str | Buffer, chunk_size: int = CHUNK_SIZE) -> int:
     """Calculate Santa's final floor based on the input string.
 
     ( means Santa goes up a floor, ) means Santa goes down a floor.
     We're starting on floor 0, there is no minimum nor maximum floor.
+
+    Accepts a string or any bytes-like buffer (bytes, memoryview, mmap).
     """
-    floor = 0
-    for char in s:
-        if char == "(":
-            floor += 1
-        elif char == ")":
-            floor -= 1
-    return floor
+    if isinstance(s, str):
+        return s.count("(") - s.count(")")
+    return sum(
+        int(np.count_nonzero(chunk == ord("(")))
+        - int(np.count_nonzero(chunk == ord(")")))
+        for chunk in _chunks(s, chunk_size)
+    )
 
 
-def basement(s: str) -> int:
-    """Find the position of the first character that causes Santa to enter the basement."""
+def basement(s: str | Buffer, chunk_size: int = CHUNK_SIZE) -> int:
+    """Find the position of the first character that causes Santa to enter the basement.
+
+    Works through the input a chunk at a time: the running floor within a chunk is
+    a cumulative sum of its steps, and the scan stops at the first chunk in which
+    that dips below zero.
+    """
     floor = 0
-    for i, char in enumerate(s):
-        if char == "(":
-            floor += 1
-        elif char == ")":
-            floor -= 1
-        if floor < 0:
-            return i + 1  # Return position (1-indexed)
+    position = 0
+    for chunk in _chunks(s, chunk_size):
+        floors = np.cumsum(STEPS[chunk], dtype=np.int64)
+        floors += floor
+        below = floors < 0
+        if below.any():
+            return position + int(below.argmax()) + 1  # Return position (1-indexed)
+        floor = int(floors[-1])
+        position += len(chunk)
     return -1  # If never enters basement
 
 
+class FloorIndex:
+    """Index over one instruction stream for answering many questions about it.
+
+    The stream is cut into blocks; for every block the index keeps the floor at
+    its start and the lowest and highest floor reached inside it. Finding the
+    floor at a position then only needs to replay part of one block, and the
+    first block in which a floor is reached can be found with a binary search
+    on the running minimum/maximum over the blocks. The instructions themselves
+    are not copied, so the buffer passed in must stay alive.
+    """
+
+    def __init__(self, s: str | Buffer, block_size: int = BLOCK_SIZE):
+        self.data = _as_array(s)
+        self.block_size = block_size
+        blocks = -(-len(self.data) // block_size)
+        # floor at the start of each block, plus the final floor
+        self.starts = np.zeros(blocks + 1, dtype=np.int64)
+        self.lows = np.empty(blocks, dtype=np.int64)
+        self.highs = np.empty(blocks, dtype=np.int64)
+
+        floor, block = 0, 0
+        chunk_size = block_size * max(1, CHUNK_SIZE // block_size)
+        for chunk in _chunks(self.data, chunk_size):
+            floors = np.cumsum(STEPS[chunk], dtype=np.int64)
+            floors += floor
+            block_starts = np.arange(0, len(chunk), block_size)
+            n = len(block_starts)
+            self.lows[block : block + n] = np.minimum.reduceat(floors, block_starts)
+            self.highs[block : block + n] = np.maximum.reduceat(floors, block_starts)
+            block_ends = np.minimum(block_starts + block_size, len(chunk)) - 1
+            self.starts[block + 1 : block + n + 1] = floors[block_ends]
+            floor, block = int(floors[-1]), block + n
+
+        # Lowest/highest floor reached up to and including each block
+        self.reached_low = np.minimum.accumulate(self.lows)
+        self.reached_high = np.maximum.accumulate(self.highs)
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def floor_at(self, position: int) -> int:
+        """Floor after following the first position instructions"""
+        if not 0 <= position <= len(self.data):
+            raise IndexError("position out of range")
+        block, offset = divmod(position, self.block_size)
+        start = block * self.block_size
+        return int(self.starts[block] + STEPS[self.data[start : start + offset]].sum())
+
+    def first_reach(self, floor: int) -> int:
+        """Position (1-indexed, like basement) of the instruction that first takes
+        Santa to the given floor; 0 for the ground floor, -1 if never reached"""
+        if floor == 0:
+            return 0
+        if floor > 0:
+            block = int(np.searchsorted(self.reached_high, floor))
+        else:
+            block = int(np.searchsorted(-self.reached_low, -floor))
+        if block == len(self.lows):
+            return -1
+        start = block * self.block_size
+        floors = np.cumsum(
+            STEPS[self.data[start : start + self.block_size]], dtype=np.int64
+        )
+        floors += self.starts[block]
+        hits = floors >= floor if floor > 0 else floors <= floor
+        return start + int(hits.argmax()) + 1
+
+
 def main():
     """Read input and print the final floor."""
-    with Path("./data/day01.txt").open("r") as file:
-        data = file.read().strip()
+    data = read_raw_file("day01.txt").strip()
     final_floor = do_floor(data)
     print(f"Santa ends up on floor: {final_floor}")
     print(f"First basement entry at position: {basement(data)}")
 
 
+@solution(1, 1)
+def run_part1():
+    return do_floor(map_raw_file("day01.txt"))
+
+
+@solution(1, 2)
+def run_part2():
+    return basement(map_raw_file("day01.txt"))
+
+
 if __name__ == "__main__":
     main()
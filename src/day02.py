@@ -1,4 +1,35 @@
-from utils.file_utils import read_file
+import mmap
+import os
+from collections.abc import Buffer, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from itertools import islice
+from typing import Optional
+
+import numpy as np
+from numpy.typing import NDArray
+
+from utils.aoc_utils import default_jobs
+from utils.file_utils import input_path, map_raw_file, read_file
+from utils.registry import solution
+
+Column = NDArray[np.int64]
+
+# Turn the x between dimensions and the line breaks into plain whitespace
+SEPARATORS = bytes.maketrans(b"x\r\n", b"   ")
+NEWLINE, X = ord("\n"), ord("x")
+BLANKS = (ord(" "), ord("\t"), ord("\r"))
+
+# Input is validated and parsed this many bytes at a time, so the temporary
+# arrays stay small whatever the size of the file; they take up to about
+# PARSE_MEMORY_PER_BYTE times the size of a chunk
+PARSE_CHUNK_SIZE = 1 << 20
+PARSE_MEMORY_PER_BYTE = 16
+# Files from this size on are parsed on a process pool, in ranges of CHUNK_SIZE.
+# A worker holds the pages of its range of the mapped file and the temporaries
+# of one parse chunk, which should fit in WORKER_MEMORY_BUDGET together.
+PARALLEL_MIN_SIZE = 1 << 26
+WORKER_MEMORY_BUDGET = 1 << 25
+CHUNK_SIZE = WORKER_MEMORY_BUDGET - PARSE_MEMORY_PER_BYTE * PARSE_CHUNK_SIZE
 
 
 def process_data():
@@ -6,6 +37,180 @@ def process_data():
     return [tuple(map(int, line.split("x"))) for line in lines]
 
 
+def parse_columns(raw: str | Buffer) -> tuple[Column, Column, Column]:
+    """Parse LxWxH lines straight into arrays of lengths, widths and heights.
+
+    The columns are filled in chunk by chunk, in an array sized for the most
+    boxes that fit in raw (a box takes at least six bytes, newline included);
+    only the pages actually filled take up memory."""
+    data = _bytes_array(raw)
+    columns = np.empty((3, (len(data) + 1) // 6), dtype=np.int64)
+    boxes = 0
+    for chunk in _column_chunks(data):
+        columns[:, boxes : boxes + chunk.shape[1]] = chunk
+        boxes += chunk.shape[1]
+    length, width, height = columns[:, :boxes]
+    return length, width, height
+
+
+def _bytes_array(raw: str | Buffer) -> NDArray[np.uint8]:
+    """The bytes of raw as an array; a buffer is used in place, not copied"""
+    return np.frombuffer(raw.encode() if isinstance(raw, str) else raw, np.uint8)
+
+
+def _column_chunks(data: NDArray[np.uint8]) -> Iterator[NDArray[np.int64]]:
+    """The boxes in the bytes as 3 x boxes arrays, one per (non-blank) range
+    of about PARSE_CHUNK_SIZE bytes"""
+    for start, end in chunk_ranges(data, PARSE_CHUNK_SIZE):
+        chunk = data[start:end]
+        boxes = _count_boxes(chunk)
+        if boxes == 0:
+            continue
+        text = chunk.tobytes().translate(SEPARATORS)
+        numbers = np.fromstring(text, dtype=np.int64, sep=" ")
+        if len(numbers) != 3 * boxes:
+            raise ValueError("expected three dimensions per box")
+        yield numbers.reshape(-1, 3).T
+
+
+def _count_boxes(data: NDArray[np.uint8]) -> int:
+    """Number of boxes in the bytes, raising ValueError unless every non-blank
+    line is exactly LxWxH, optionally surrounded by whitespace.
+
+    Once whitespace is ruled out inside the lines it can be dropped, leaving
+    only digits, x's and newlines. Then a line is LxWxH when every x has a
+    digit on both sides and the line holds exactly two x's. The x's of a line
+    are counted from the separators (x's and newlines) only, in order.
+    """
+    blank = (data == BLANKS[0]) | (data == BLANKS[1]) | (data == BLANKS[2])
+    if blank.any():
+        if _inner_whitespace(data, blank):
+            raise ValueError("expected three dimensions per box")
+        data = data[~blank]
+    del blank
+    separator = (data == X) | (data == NEWLINE)
+    if not (separator | _digits(data)).all():
+        raise ValueError("expected three dimensions per box")
+    separator_at = np.flatnonzero(separator)
+    del separator
+    kinds = data[separator_at]
+    x_at = separator_at[kinds == X]
+    if len(x_at) and (
+        x_at[0] == 0
+        or x_at[-1] == len(data) - 1
+        or not (_digits(data[x_at - 1]) & _digits(data[x_at + 1])).all()
+    ):
+        raise ValueError("expected three dimensions per box")
+    # Lines end at the newlines, and at the end of the data if that is no newline
+    newline_index = np.flatnonzero(kinds == NEWLINE)
+    line_ends = separator_at[newline_index]
+    if len(data) and data[-1] != NEWLINE:
+        newline_index = np.append(newline_index, len(kinds))
+        line_ends = np.append(line_ends, len(data))
+    filled = np.diff(line_ends, prepend=-1) > 1
+    x_per_line = np.diff(newline_index, prepend=-1) - 1
+    if not (x_per_line[filled] == 2).all():
+        raise ValueError("expected three dimensions per box")
+    return int(filled.sum())
+
+
+def _digits(data: NDArray[np.uint8]) -> NDArray[np.bool_]:
+    return data - np.uint8(ord("0")) <= 9
+
+
+def _inner_whitespace(data: NDArray[np.uint8], blank: NDArray[np.bool_]) -> bool:
+    """Whether any line has whitespace between two of its other characters"""
+    # Collapse every run of whitespace to its first character
+    first = np.ones(len(data), dtype=np.bool_)
+    np.logical_not(blank[1:] & blank[:-1], out=first[1:])
+    data, blank = data[first], blank[first]
+    solid = ~blank & (data != NEWLINE)
+    return bool((solid[:-2] & blank[1:-1] & solid[2:]).any())
+
+
+def process_columns() -> tuple[Column, Column, Column]:
+    return parse_columns(map_raw_file("day02.txt"))
+
+
+def chunk_ranges(raw: Buffer, chunk_size: int) -> list[tuple[int, int]]:
+    """Split raw into (start, end) byte ranges of at least chunk_size bytes
+    (except the last), each ending right after a newline or at the end"""
+    data = _bytes_array(raw)
+    ranges = []
+    start = 0
+    while start < len(data):
+        end = _line_end(data, start + chunk_size - 1)
+        ranges.append((start, end))
+        start = end
+    return ranges
+
+
+def _line_end(data: NDArray[np.uint8], position: int, window: int = 1 << 12) -> int:
+    """Offset just past the first newline from position on, or the length of
+    data; searched a window at a time, as the next newline is usually close"""
+    while position < len(data):
+        newlines = np.flatnonzero(data[position : position + window] == NEWLINE)
+        if len(newlines):
+            return position + int(newlines[0]) + 1
+        position += window
+    return len(data)
+
+
+def _totals(raw: Buffer) -> tuple[int, int]:
+    """Paper and ribbon totals, summed over the parse chunks of raw so that
+    only one chunk's boxes are held at a time"""
+    paper = ribbon = 0
+    for columns in _column_chunks(_bytes_array(raw)):
+        paper += wrap_total(*columns)
+        ribbon += ribbon_total(*columns)
+    return paper, ribbon
+
+
+def _range_totals(path: str, start: int, end: int) -> tuple[int, int]:
+    """Paper and ribbon totals of one byte range of the file, read in place
+    from a mapping of it"""
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+        with memoryview(m) as view:
+            return _totals(view[start:end])
+
+
+def parallel_totals(
+    path: str, jobs: Optional[int] = None, chunk_size: int = CHUNK_SIZE
+) -> tuple[int, int]:
+    """Paper and ribbon totals of the file, parsed range by range on a pool of
+    jobs worker processes (default_jobs() if not given), a few ranges per
+    worker in flight at a time. Only the per-range totals are combined, so the
+    boxes of the whole file are never held at once."""
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return 0, 0
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            ranges = iter(chunk_ranges(m, chunk_size))
+    workers = jobs or default_jobs()
+    paper = ribbon = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending: set[Future] = set()
+        while True:
+            for start, end in islice(ranges, 2 * workers - len(pending)):
+                pending.add(pool.submit(_range_totals, path, start, end))
+            if not pending:
+                return paper, ribbon
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                range_paper, range_ribbon = future.result()
+                paper += range_paper
+                ribbon += range_ribbon
+
+
+def totals() -> tuple[int, int]:
+    """Paper and ribbon totals of the input, in parallel for large files"""
+    path = input_path("day02.txt")
+    if os.path.getsize(path) >= PARALLEL_MIN_SIZE:
+        return parallel_totals(path)
+    return _totals(map_raw_file("day02.txt"))
+
+
 def part1(data):
     return sum(wrap(length, width, height) for length, width, height in data)
 
@@ -16,6 +221,13 @@ def wrap(length: int, width: int, height: int) -> int:
     )
 
 
+def wrap_total(length: Column, width: Column, height: Column) -> int:
+    """Paper for all boxes at once; the same as summing wrap over them"""
+    front, side, top = length * width, width * height, height * length
+    smallest = np.minimum(np.minimum(front, side), top)
+    return int(2 * (front.sum() + side.sum() + top.sum()) + smallest.sum())
+
+
 def ribbon(length: int, width: int, height: int) -> int:
     return (
         2 * min(length + width, width + height, height + length)
@@ -23,10 +235,28 @@ def ribbon(length: int, width: int, height: int) -> int:
     )
 
 
+def ribbon_total(length: Column, width: Column, height: Column) -> int:
+    """Ribbon for all boxes at once; the same as summing ribbon over them.
+    The smallest perimeter leaves out the longest dimension."""
+    longest = np.maximum(np.maximum(length, width), height)
+    perimeters = 2 * (length.sum() + width.sum() + height.sum() - longest.sum())
+    return int(perimeters + (length * width * height).sum())
+
+
 def part2(data):
     return sum(ribbon(length, width, height) for length, width, height in data)
 
 
+@solution(2, 1)
+def run_part1():
+    return totals()[0]
+
+
+@solution(2, 2)
+def run_part2():
+    return totals()[1]
+
+
 if __name__ == "__main__":
     data = process_data()
     print(part1(data))
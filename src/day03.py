@@ -1,4 +1,22 @@
-from utils.file_utils import read_raw_file
+from collections.abc import Buffer, Iterator
+
+import numpy as np
+from numpy.typing import NDArray
+
+from utils.file_utils import map_raw_file, read_raw_file
+from utils.registry import solution
+
+# Bounding boxes up to this many houses are tracked in a bitmap (one byte per
+# house), larger ones by sorting the packed house coordinates
+BITMAP_MAX_CELLS = 1 << 24
+# Moves whose paths are worked out at a time
+CHUNK_SIZE = 1 << 16
+
+# Step along x and y for every byte value; anything but a move stays put
+DX = np.zeros(256, dtype=np.int8)
+DX[ord(">")], DX[ord("<")] = 1, -1
+DY = np.zeros(256, dtype=np.int8)
+DY[ord("^")], DY[ord("v")] = 1, -1
 
 
 def process_data():
@@ -8,7 +26,7 @@ def process_data():
 
 def part1(data):
     currpos = 0, 0
-    visited = set(currpos)
+    visited: set[tuple[int, int]] = {currpos}
     for move in data:
         if move == "^":
             currpos = (currpos[0], currpos[1] + 1)
@@ -53,6 +71,115 @@ def part2(data):
     return len(visited)
 
 
+def _turns(
+    moves: str | Buffer, agents: int, chunk_size: int
+) -> Iterator[NDArray[np.uint8]]:
+    """The moves in chunks of about chunk_size whole turns of all agents (the
+    last one may be short). With several agents only actual moves take a turn,
+    so anything else is dropped first."""
+    data = np.frombuffer(
+        moves.encode() if isinstance(moves, str) else moves, dtype=np.uint8
+    )
+    step = max(1, chunk_size // agents) * agents
+    if agents == 1:
+        for first in range(0, len(data), step):
+            yield data[first : first + step]
+        return
+    left_over = data[:0]
+    for first in range(0, len(data), step):
+        chunk = data[first : first + step]
+        chunk = np.concatenate((left_over, chunk[(DX[chunk] != 0) | (DY[chunk] != 0)]))
+        whole = len(chunk) - len(chunk) % agents
+        if whole:
+            yield chunk[:whole]
+        left_over = chunk[whole:]
+    if len(left_over):
+        yield left_over
+
+
+def paths(
+    moves: str | Buffer, agents: int = 1, chunk_size: int = CHUNK_SIZE
+) -> Iterator[tuple[NDArray[np.int32], NDArray[np.int32]]]:
+    """x and y of every house along the moves, starting at the origin, for
+    agents taking turns: one row per turn and one column per agent, a chunk of
+    about chunk_size moves at a time. Every chunk of paths is a cumulative sum
+    down the columns, continuing from the end of the previous one."""
+    origin = np.zeros((1, agents), dtype=np.int32)
+    yield origin, origin
+    x_end, y_end = origin, origin
+    for chunk in _turns(moves, agents, chunk_size):
+        turns = -(-len(chunk) // agents)
+        x = np.zeros((turns, agents), dtype=np.int32)
+        y = np.zeros((turns, agents), dtype=np.int32)
+        # Agents without a move in the last turn stay put
+        x.flat[: len(chunk)] = DX[chunk]
+        y.flat[: len(chunk)] = DY[chunk]
+        np.cumsum(x, axis=0, out=x)
+        np.cumsum(y, axis=0, out=y)
+        x += x_end
+        y += y_end
+        x_end, y_end = x[-1:], y[-1:]
+        yield x, y
+
+
+def _pack(
+    x: NDArray[np.int32], y: NDArray[np.int32], x_min: int, y_min: int, height: int
+) -> NDArray[np.int64]:
+    """The houses as single int64s, relative to the bounding box"""
+    houses = x.ravel().astype(np.int64)
+    houses -= x_min
+    houses *= height
+    houses += y.ravel()
+    houses -= y_min
+    return houses
+
+
+def unique_houses(
+    moves: str | Buffer, agents: int = 1, chunk_size: int = CHUNK_SIZE
+) -> int:
+    """Houses that receive at least one present when agents take turns
+    following the moves; the same as part1 for one agent, part2 for two.
+
+    The paths are walked twice, a chunk at a time: once for the bounding box,
+    then to pack every house into an integer relative to it. A small box is
+    marked off in a bitmap. Otherwise the distinct houses of the chunks are
+    merged into a sorted array of distinct houses, whenever they add up to as
+    many as that array holds."""
+    if agents < 1:
+        raise ValueError(f"Need at least one agent, got {agents}")
+    x_min = y_min = x_max = y_max = 0
+    for x, y in paths(moves, agents, chunk_size):
+        x_min, x_max = min(x_min, int(x.min())), max(x_max, int(x.max()))
+        y_min, y_max = min(y_min, int(y.min())), max(y_max, int(y.max()))
+    width, height = x_max - x_min + 1, y_max - y_min + 1
+
+    if width * height <= BITMAP_MAX_CELLS:
+        bitmap = np.zeros(width * height, dtype=np.bool_)
+        for x, y in paths(moves, agents, chunk_size):
+            bitmap[_pack(x, y, x_min, y_min, height)] = True
+        return int(np.count_nonzero(bitmap))
+    # Half the memory for the houses, if they fit
+    dtype = np.uint32 if width * height <= 1 << 32 else np.int64
+    seen = np.empty(0, dtype=dtype)
+    new: list[NDArray] = []
+    for x, y in paths(moves, agents, chunk_size):
+        new.append(np.unique(_pack(x, y, x_min, y_min, height).astype(dtype)))
+        if sum(map(len, new)) >= len(seen):
+            seen = np.unique(np.concatenate([seen, *new]))
+            new = []
+    return len(np.unique(np.concatenate([seen, *new])))
+
+
+@solution(3, 1)
+def run_part1():
+    return unique_houses(map_raw_file("day03.txt"))
+
+
+@solution(3, 2)
+def run_part2():
+    return unique_houses(map_raw_file("day03.txt"), agents=2)
+
+
 if __name__ == "__main__":
     data = process_data()
     print(part1(data))
@@ -1,34 +1,267 @@
+"""Day 4: mining AdventCoins.
+
+Searches can checkpoint their progress: for every prefix and difficulty the
+checkpoint file (.aoc-day04-checkpoints.json in the project root, or the file
+named by AOC_DAY04_CHECKPOINTS; saves lock it through a .lock file next to it)
+records the suffix below which everything has
+been searched without a match, and the next search resumes from there. A
+suffix without enough zeros for a lower difficulty has too few for a higher
+one as well, so a search also resumes from the checkpoints of lower
+difficulties.
+"""
+
+import fcntl
+import json
+import multiprocessing
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from ctypes import c_longlong
+from dataclasses import dataclass
 from hashlib import md5
+from itertools import count
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from time import perf_counter
+from typing import Callable, Optional
+
+from utils.aoc_utils import default_jobs
+from utils.file_utils import PROJECT_ROOT
+from utils.registry import solution
 
 PREFIX = "iwrupvqb"
+# Suffixes are searched in blocks of this many, handed out to the workers in turn
+BLOCK_SIZE = 100_000
+# ... and formatted this many at a time
+FORMAT_BATCH = 10_000
+CHECKPOINTS_ENV = "AOC_DAY04_CHECKPOINTS"
+# Seconds between checkpoints during a search
+CHECKPOINT_INTERVAL = 5.0
+# Smallest match found so far by the search the worker process belongs to; set
+# by the pool initializer, unset when searching in the calling process
+_found: Optional[c_longlong] = None
+NOT_FOUND = 2**63 - 1
+
+
+@dataclass
+class Progress:
+    """Where a search stands, reported after every finished block"""
+
+    prefix: str
+    difficulty: int
+    searched: int  # every suffix below this has been searched
+    hashes: int  # hashes computed by this search so far
+    elapsed: float
+
+    @property
+    def hashes_per_second(self) -> float:
+        return self.hashes / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def checkpoints_file() -> Path:
+    return Path(
+        os.environ.get(CHECKPOINTS_ENV, PROJECT_ROOT / ".aoc-day04-checkpoints.json")
+    )
+
+
+def checkpoint_key(prefix: str, difficulty: int) -> str:
+    return f"{prefix}:{difficulty}"
+
+
+def load_checkpoints() -> dict[str, int]:
+    """The saved checkpoints; none if the file is missing or unreadable"""
+    try:
+        with open(checkpoints_file()) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _umask() -> int:
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+def save_checkpoint(prefix: str, difficulty: int, searched: int) -> None:
+    """Record that all suffixes below searched have been searched.
+
+    Saves hold a lock (on a .lock file next to the checkpoint file) from
+    reading the checkpoints to replacing them, so concurrent searches do not
+    drop each other's keys. The file is written under a name of its own and
+    then moved into place, so readers never see a half-written file; it gets
+    the permissions of a newly created file, as NamedTemporaryFile makes it
+    private."""
+    path = checkpoints_file()
+    with open(path.with_name(f"{path.name}.lock"), "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        checkpoints = load_checkpoints()
+        key = checkpoint_key(prefix, difficulty)
+        if checkpoints.get(key, 0) >= searched:
+            return
+        checkpoints[key] = searched
+        with NamedTemporaryFile(
+            "w",
+            dir=path.parent,
+            prefix=f"{path.name}.",
+            suffix=".partial",
+            delete=False,
+        ) as f:
+            json.dump(dict(sorted(checkpoints.items())), f, indent=2)
+        try:
+            os.chmod(f.name, 0o666 & ~_umask())
+            os.replace(f.name, path)
+        except OSError:
+            os.unlink(f.name)
+            raise
+
+
+def resume_point(prefix: str, difficulty: int) -> int:
+    """Suffix to start a search from, going by the checkpoints"""
+    checkpoints = load_checkpoints()
+    return max(
+        (
+            checkpoints.get(checkpoint_key(prefix, lower), 0)
+            for lower in range(1, difficulty + 1)
+        ),
+        default=0,
+    )
+
+
+def threshold(difficulty: int) -> bytes:
+    """Raw digests below this start with difficulty zero hex digits"""
+    if not 1 <= difficulty <= 32:
+        raise ValueError("difficulty must be between 1 and 32 hex digits")
+    return (16 ** (32 - difficulty)).to_bytes(16, "big")
+
+
+def _share_found(found: c_longlong) -> None:
+    global _found
+    _found = found
+
+
+def search(prefix: str, difficulty: int, start: int, stop: int) -> Optional[int]:
+    """Smallest suffix in [start, stop) for which the hash of prefix + suffix
+    starts with difficulty zeros, or None.
+
+    The prefix is hashed once and every candidate continues from a copy of
+    that state; suffixes are formatted a batch at a time, and the leading
+    zeros are checked by comparing the raw digest against a threshold. In a
+    worker of mine, the search gives up (returning None) before a batch that
+    starts beyond the smallest match found so far.
+    """
+    below = threshold(difficulty)
+    fresh = md5(prefix.encode()).copy
+    for first in range(start, stop, FORMAT_BATCH):
+        if _found is not None and first > _found.value:
+            return None
+        batch = " ".join(map(str, range(first, min(first + FORMAT_BATCH, stop))))
+        for offset, suffix in enumerate(batch.encode().split()):
+            candidate = fresh()
+            candidate.update(suffix)
+            if candidate.digest() < below:
+                return first + offset
+    return None
+
+
+def mine(
+    prefix: str = PREFIX,
+    difficulty: int = 5,
+    start: Optional[int] = None,
+    jobs: Optional[int] = None,
+    block_size: int = BLOCK_SIZE,
+    checkpoints: bool = False,
+    progress: Optional[Callable[[Progress], None]] = None,
+) -> int:
+    """Smallest suffix from start on that mines an AdventCoin.
+
+    The suffixes are cut into blocks that are searched on a pool of jobs worker
+    processes (default_jobs() if not given), a few blocks per worker in flight
+    at a time. A match is only the answer once all blocks before it are done;
+    from then on no new blocks are handed out, and blocks after it are
+    cancelled or, when already running, stop at their next batch of suffixes.
+    Running blocks also stop when the search ends in any other way.
+
+    With checkpoints, the search starts where earlier ones left off (unless a
+    start is given) and saves its own progress every CHECKPOINT_INTERVAL
+    seconds and when it ends, also when it is interrupted. A search from a
+    start beyond the checkpoint skips suffixes, so it saves nothing. progress
+    is called after every finished block.
+    """
+    resume = resume_point(prefix, difficulty) if checkpoints else 0
+    if start is None:
+        start = resume
+    # Only then is everything below the searched suffixes known to be searched
+    checkpoints = checkpoints and start <= resume
+    workers = jobs or default_jobs()
+    in_flight = 2 * workers
+    searched, finished_blocks, hashes = start, set(), 0
+    began = saved = perf_counter()
+    best: Optional[int] = None
+    # Shared with the workers, so blocks beyond it stop early
+    found = multiprocessing.RawValue(c_longlong, NOT_FOUND)
+    pending: dict[Future, int] = {}
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_share_found, initargs=(found,)
+        ) as pool:
+            try:
+                blocks = count(start, block_size)
+                while True:
+                    while len(pending) < in_flight and best is None:
+                        first = next(blocks)
+                        future = pool.submit(
+                            search, prefix, difficulty, first, first + block_size
+                        )
+                        pending[future] = first
+                    if best is not None and all(
+                        first > best for first in pending.values()
+                    ):
+                        searched = best
+                        return best
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        first = pending.pop(future)
+                        if (suffix := future.result()) is not None:
+                            best = suffix if best is None else min(best, suffix)
+                            found.value = best
+                            hashes += suffix - first + 1
+                        elif best is None or first < best:
+                            finished_blocks.add(first)
+                            hashes += block_size
+                        # else the block may have stopped early, and is not needed
+                    while searched in finished_blocks:
+                        finished_blocks.remove(searched)
+                        searched += block_size
+                    now = perf_counter()
+                    if progress is not None:
+                        progress(
+                            Progress(prefix, difficulty, searched, hashes, now - began)
+                        )
+                    if checkpoints and now - saved >= CHECKPOINT_INTERVAL:
+                        save_checkpoint(prefix, difficulty, searched)
+                        saved = now
+            finally:
+                # Whatever ends the search, leaving the pool should not wait for
+                # the blocks in flight: queued ones are cancelled, and running
+                # ones stop at their next batch
+                found.value = -1
+                for future in pending:
+                    future.cancel()
+    finally:
+        if checkpoints:
+            save_checkpoint(prefix, difficulty, searched)
 
 
+@solution(4, 1)
 def part1():
-    suffix = 0
-    while True:
-        key = f"{PREFIX}{suffix}".encode()
-        hash = md5(key).hexdigest()
-        if hash.startswith("00000"):
-            print(f"Found: {suffix} -> {hash}")
-            break
-        suffix += 1
-        if suffix % 100000 == 0:
-            print(f"Checked {suffix} suffixes, last hash: {hash}")
+    return mine(PREFIX, 5, checkpoints=True)
 
 
+@solution(4, 2)
 def part2():
-    suffix = 346386
-    while True:
-        key = f"{PREFIX}{suffix}".encode()
-        hash = md5(key).hexdigest()
-        if hash.startswith("000000"):
-            print(f"Found: {suffix} -> {hash}")
-            break
-        suffix += 1
-        if suffix % 100000 == 0:
-            print(f"Checked {suffix} suffixes, last hash: {hash}")
+    return mine(PREFIX, 6, checkpoints=True)
 
 
 if __name__ == "__main__":
-    part1()
-    part2()
+    print(f"Part 1: {part1()}")
+    print(f"Part 2: {part2()}")
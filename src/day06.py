@@ -1,55 +1,306 @@
 import re
+from collections.abc import Iterable
+from typing import NamedTuple, Optional
+
+import numpy as np
+from numpy.typing import NDArray
+
 from utils.file_utils import read_file
+from utils.registry import solution
+
+GRID_SIZE = 1000
+
+# Action codes, in the order of ACTIONS
+TURN_ON, TURN_OFF, TOGGLE = range(3)
+ACTIONS = ("turn on", "turn off", "toggle")
+
+# One row per instruction, with the corners of the rectangle (inclusive)
+INSTRUCTION = np.dtype(
+    [
+        ("action", np.uint8),
+        ("x0", np.int64),
+        ("y0", np.int64),
+        ("x1", np.int64),
+        ("y1", np.int64),
+    ]
+)
+Instructions = NDArray[np.void]
+
+PATTERN = re.compile(r"(turn on|turn off|toggle) (\d+),(\d+) through (\d+),(\d+)")
+
+
+def parse(lines: Iterable[str]) -> Instructions:
+    """Parse instruction lines into an INSTRUCTION array; a line that is not an
+    instruction, or whose corners are the wrong way round, raises a ValueError
+    naming its line number"""
+    codes = {action: code for code, action in enumerate(ACTIONS)}
+    rows = []
+    for number, line in enumerate(lines, 1):
+        match = PATTERN.fullmatch(line.strip())
+        if match is None:
+            raise ValueError(f"Line {number}: not an instruction: {line.strip()!r}")
+        action, x0, y0, x1, y1 = match.groups()
+        row = (codes[action], int(x0), int(y0), int(x1), int(y1))
+        if row[1] > row[3] or row[2] > row[4]:
+            raise ValueError(f"Line {number}: corners out of order: {line.strip()!r}")
+        rows.append(row)
+    return np.array(rows, dtype=INSTRUCTION)
+
+
+def process_data() -> Instructions:
+    return parse(read_file("day06.txt"))
+
+
+def _turn_on(lights: NDArray[np.bool_]) -> None:
+    lights[...] = True
+
+
+def _turn_off(lights: NDArray[np.bool_]) -> None:
+    lights[...] = False
+
+
+def _toggle(lights: NDArray[np.bool_]) -> None:
+    np.logical_not(lights, out=lights)
+
+
+def _brighten(lights: NDArray[np.int64]) -> None:
+    lights += 1
+
+
+def _dim(lights: NDArray[np.int64]) -> None:
+    lights -= 1
+    np.maximum(lights, 0, out=lights)
+
+
+def _brighten_twice(lights: NDArray[np.int64]) -> None:
+    lights += 2
+
+
+# What each action code does to a slice of the grid, in either part
+SWITCH_SLICE = (_turn_on, _turn_off, _toggle)
+DIM_SLICE = (_brighten, _dim, _brighten_twice)
+
+
+def _boundaries(starts: NDArray[np.int64], ends: NDArray[np.int64], size: int):
+    """Sorted distinct coordinates at which a rectangle starts or ends (just
+    past its last light), plus the edges of the grid"""
+    return np.unique(np.concatenate(([0, size], starts, ends + 1)))
+
+
+def run_lights(
+    instructions: Instructions,
+    brightness: bool = False,
+    size: int = GRID_SIZE,
+    compressed: bool = False,
+) -> int:
+    """Follow the instructions on a size x size grid and return the number of
+    lights on, or their total brightness. Every instruction is a single slice
+    operation on the grid.
+
+    The compressed grid has one cell per block of lights between consecutive
+    rectangle boundaries, as all lights in such a block always end up in the
+    same state; its size depends on the number of instructions only, not on
+    the size of the grid. A rectangle that does not fit on the grid raises a
+    ValueError.
+    """
+    if (
+        len(instructions)
+        and max(instructions["x1"].max(), instructions["y1"].max()) >= size
+    ):
+        raise ValueError(f"Rectangle does not fit on a {size} x {size} grid")
+    x0, y0 = instructions["x0"], instructions["y0"]
+    x1, y1 = instructions["x1"] + 1, instructions["y1"] + 1
+    if compressed:
+        xs = _boundaries(instructions["x0"], instructions["x1"], size)
+        ys = _boundaries(instructions["y0"], instructions["y1"], size)
+        x0, x1 = np.searchsorted(xs, x0), np.searchsorted(xs, x1)
+        y0, y1 = np.searchsorted(ys, y0), np.searchsorted(ys, y1)
+        # The number of lights in each block of the compressed grid
+        areas = np.outer(np.diff(ys), np.diff(xs))
+        shape = areas.shape
+    else:
+        areas, shape = None, (size, size)
+    lights = np.zeros(shape, dtype=np.int64 if brightness else np.bool_)
+    apply = DIM_SLICE if brightness else SWITCH_SLICE
+    rectangles = zip(
+        instructions["action"].tolist(), *(c.tolist() for c in (x0, y0, x1, y1))
+    )
+    for action, left, top, right, bottom in rectangles:
+        apply[action](lights[top:bottom, left:right])
+    return int(lights.sum() if areas is None else (lights * areas).sum())
+
+
+def part1(instructions, compressed: bool = False):
+    return run_lights(instructions, compressed=compressed)
+
 
-PATTERN = re.compile(r"^(\w+ *\w*) (\d+,\d+) through (\d+,\d+)$")
-
-
-def process_data():
-    instructions = []
-    data = read_file("day06.txt")
-    for line in data:
-        match = PATTERN.findall(line)[0]
-        if match:
-            instructions.append(
-                (
-                    match[0],
-                    tuple(map(int, match[1].split(","))),
-                    tuple(map(int, match[2].split(","))),
-                )
-            )
+def part2(instructions, compressed: bool = False):
+    return run_lights(instructions, brightness=True, compressed=compressed)
+
+
+# Stands in for an infinite bound of a Clamp; composing updates moves it by
+# their offsets, which keeps it far beyond any brightness the lights can reach
+UNBOUNDED = 1 << 62
+
+
+class Clamp(NamedTuple):
+    """The light update v -> min(max(sign * v + offset, low), high). Every
+    action of both parts is one, and so is any sequence of them, which is what
+    lets the quadtree postpone updates"""
+
+    sign: int
+    offset: int
+    low: int = -UNBOUNDED
+    high: int = UNBOUNDED
+
+    def __call__(self, value: int) -> int:
+        return min(max(self.sign * value + self.offset, self.low), self.high)
+
+    def then(self, other: "Clamp") -> "Clamp":
+        """The update that applies self and then other"""
+        if other.sign == 1:
+            low, high = self.low + other.offset, self.high + other.offset
+        else:
+            low, high = other.offset - self.high, other.offset - self.low
+        if high < other.low:
+            low = high = other.low
+        elif low > other.high:
+            low = high = other.high
         else:
-            print(f"No match found for {line.strip()}")
-    return instructions
-
-
-def part1(instructions):
-    grid = [False] * 1000 * 1000
-    for instruction in instructions:
-        action, start, end = instruction
-        for y in range(start[1], end[1] + 1):
-            for x in range(start[0], end[0] + 1):
-                if action == "turn on":
-                    grid[y * 1000 + x] = True
-                elif action == "turn off":
-                    grid[y * 1000 + x] = False
-                elif action == "toggle":
-                    grid[y * 1000 + x] = not grid[y * 1000 + x]
-    return sum(grid)
-
-
-def part2(instructions):
-    grid = [0] * 1000 * 1000
-    for instruction in instructions:
-        action, start, end = instruction
-        for y in range(start[1], end[1] + 1):
-            for x in range(start[0], end[0] + 1):
-                if action == "turn on":
-                    grid[y * 1000 + x] += 1
-                elif action == "turn off":
-                    grid[y * 1000 + x] = max(0, grid[y * 1000 + x] - 1)
-                elif action == "toggle":
-                    grid[y * 1000 + x] += 2
-    return sum(grid)
+            low, high = max(low, other.low), min(high, other.high)
+        sign = self.sign * other.sign
+        return Clamp(sign, other.sign * self.offset + other.offset, low, high)
+
+
+# The update for each action code, in either part
+SWITCH = (Clamp(1, 0, 1, 1), Clamp(1, 0, 0, 0), Clamp(-1, 1))
+DIM = (Clamp(1, 1), Clamp(1, -1, 0), Clamp(1, 2))
+
+
+class _Quad:
+    """A square-ish block of lights: either a leaf in which all lights have
+    the same value, or split in up to four parts with an update pending for
+    them"""
+
+    __slots__ = ("x0", "y0", "x1", "y1", "total", "low", "high", "parts", "pending")
+
+    def __init__(self, x0: int, y0: int, x1: int, y1: int, value: int = 0):
+        self.x0, self.y0, self.x1, self.y1 = x0, y0, x1, y1
+        self.total = value * (x1 - x0) * (y1 - y0)
+        self.low = self.high = value
+        self.parts: Optional[list["_Quad"]] = None
+        self.pending: Optional[Clamp] = None
+
+    def area(self) -> int:
+        return (self.x1 - self.x0) * (self.y1 - self.y0)
+
+    def transform(self, update: Clamp) -> bool:
+        """Apply update to the whole block without visiting its parts; False
+        if that is not possible because it changes the lights by different
+        amounts"""
+        low, high = update(self.low), update(self.high)
+        if low == high:
+            self.total = low * self.area()
+        elif update.low <= update.sign * self.low + update.offset <= update.high and (
+            update.low <= update.sign * self.high + update.offset <= update.high
+        ):
+            self.total = update.sign * self.total + update.offset * self.area()
+        else:
+            return False
+        self.low, self.high = min(low, high), max(low, high)
+        if low == high:
+            self.parts = self.pending = None
+        elif self.parts is not None:
+            self.pending = update if self.pending is None else self.pending.then(update)
+        return True
+
+    def split(self) -> list["_Quad"]:
+        """The parts, after handing them any pending update"""
+        if self.parts is None:
+            xs = sorted({self.x0, (self.x0 + self.x1) // 2, self.x1})
+            ys = sorted({self.y0, (self.y0 + self.y1) // 2, self.y1})
+            self.parts = [
+                _Quad(x0, y0, x1, y1, self.low)
+                for x0, x1 in zip(xs, xs[1:])
+                for y0, y1 in zip(ys, ys[1:])
+            ]
+        elif self.pending is not None:
+            for part in self.parts:
+                part.transform(self.pending)
+            self.pending = None
+        return self.parts
+
+    def update(self, update: Clamp, x0: int, y0: int, x1: int, y1: int) -> None:
+        if x1 <= self.x0 or self.x1 <= x0 or y1 <= self.y0 or self.y1 <= y0:
+            return
+        covered = x0 <= self.x0 and self.x1 <= x1 and y0 <= self.y0 and self.y1 <= y1
+        if covered and self.transform(update):
+            return
+        parts = self.split()
+        for part in parts:
+            part.update(update, x0, y0, x1, y1)
+        self.total = sum(part.total for part in parts)
+        self.low = min(part.low for part in parts)
+        self.high = max(part.high for part in parts)
+        if self.low == self.high:
+            self.parts = None
+
+    def query(self, x0: int, y0: int, x1: int, y1: int) -> int:
+        x0, y0 = max(x0, self.x0), max(y0, self.y0)
+        x1, y1 = min(x1, self.x1), min(y1, self.y1)
+        if x1 <= x0 or y1 <= y0:
+            return 0
+        if (x0, y0, x1, y1) == (self.x0, self.y0, self.x1, self.y1):
+            return self.total
+        if self.parts is None:
+            return self.low * (x1 - x0) * (y1 - y0)
+        return sum(part.query(x0, y0, x1, y1) for part in self.split())
+
+
+class LightTree:
+    """The lights as a quadtree, for mixing instructions with questions about
+    regions (how many lights are on, or how bright it is, in a rectangle).
+
+    Blocks in which all lights are the same are not split any further, and an
+    update covering a whole block is kept there until a later update or query
+    needs to look inside it. Both cost in the order of the length of the
+    rectangle's edges, rather than of its area.
+    """
+
+    def __init__(self, size: int = GRID_SIZE, brightness: bool = False):
+        self.size = size
+        self.updates = DIM if brightness else SWITCH
+        self.root = _Quad(0, 0, size, size)
+
+    def apply(self, action: int, start: tuple[int, int], end: tuple[int, int]) -> None:
+        """Follow one instruction, given by its action code; corners are
+        inclusive, as in the puzzle"""
+        (x0, y0), (x1, y1) = start, end
+        self.root.update(self.updates[action], x0, y0, x1 + 1, y1 + 1)
+
+    def apply_all(self, instructions: Instructions) -> None:
+        for action, x0, y0, x1, y1 in instructions.tolist():
+            self.apply(action, (x0, y0), (x1, y1))
+
+    def query(
+        self,
+        start: tuple[int, int] = (0, 0),
+        end: Optional[tuple[int, int]] = None,
+    ) -> int:
+        """Lights on (or total brightness) in the rectangle, by default the
+        whole grid; corners are inclusive"""
+        (x0, y0), (x1, y1) = start, end or (self.size - 1, self.size - 1)
+        return self.root.query(x0, y0, x1 + 1, y1 + 1)
+
+
+@solution(6, 1)
+def run_part1():
+    return part1(process_data())
+
+
+@solution(6, 2)
+def run_part2():
+    return part2(process_data())
 
 
 if __name__ == "__main__":
@@ -1,102 +1,202 @@
-from utils.file_utils import read_file
-from typing import Dict
+from heapq import heappop, heappush
+from typing import Callable, Dict, Optional
+
+from utils.file_utils import map_file
+from utils.registry import solution
 
 
 def parse(fname: str) -> Dict[str, str]:
     """Parse instructions into a dictionary mapping wire -> instruction"""
     instructions = {}
-    for line in read_file(fname):
-        parts = line.split(" -> ")
-        source = parts[0]
-        target = parts[1]
-        instructions[target] = source
+    with map_file(fname) as lines:
+        for line in lines:
+            parts = line.split(" -> ")
+            source = parts[0]
+            target = parts[1]
+            instructions[target] = source
     return instructions
 
 
-def evaluate_wire(
-    wire: str, instructions: Dict[str, str], cache: Dict[str, int]
-) -> int:
-    """Recursively evaluate a wire's signal value with memoization"""
+# Gate codes, indexing OPERATIONS
+ASSIGN, NOT, AND, OR, LSHIFT, RSHIFT = range(6)
+OPERATORS = {"AND": AND, "OR": OR, "LSHIFT": LSHIFT, "RSHIFT": RSHIFT}
+MASK = 0xFFFF
 
-    # If already computed, return cached value
-    if wire in cache:
-        return cache[wire]
+# Every gate keeps its signal in 16 bits, also when fed large constants
+OPERATIONS: tuple[Callable[[int, int], int], ...] = (
+    lambda left, right: left & MASK,
+    lambda left, right: ~left & MASK,
+    lambda left, right: left & right & MASK,
+    lambda left, right: (left | right) & MASK,
+    lambda left, right: (left << right) & MASK,
+    lambda left, right: (left >> right) & MASK,
+)
 
-    # If it's a number, return it directly
-    if wire.isdigit():
-        value = int(wire)
-        cache[wire] = value
-        return value
+Gate = tuple[int, str, Optional[str]]
 
-    # Get the instruction for this wire
-    if wire not in instructions:
-        raise ValueError(f"No instruction found for wire {wire}")
 
-    instruction = instructions[wire]
+def parse_gate(instruction: str) -> Gate:
+    """Gate code and operands (wire names or numbers) of an instruction"""
     parts = instruction.split()
-
     if len(parts) == 1:
         # Direct assignment: "123" or "x"
-        value = evaluate_wire(parts[0], instructions, cache)
-    elif len(parts) == 2:
+        return ASSIGN, parts[0], None
+    if len(parts) == 2:
         # NOT operation: "NOT x"
-        if parts[0] == "NOT":
-            value = (~evaluate_wire(parts[1], instructions, cache)) & 0xFFFF
-        else:
+        if parts[0] != "NOT":
             raise ValueError(f"Unknown single operator: {parts[0]}")
-    elif len(parts) == 3:
+        return NOT, parts[1], None
+    if len(parts) == 3:
         # Binary operations: "x AND y", "x OR y", "x LSHIFT 2", "y RSHIFT 2"
-        left = evaluate_wire(parts[0], instructions, cache)
-        operator = parts[1]
-        right = evaluate_wire(parts[2], instructions, cache)
-
-        if operator == "AND":
-            value = left & right
-        elif operator == "OR":
-            value = left | right
-        elif operator == "LSHIFT":
-            value = (left << right) & 0xFFFF
-        elif operator == "RSHIFT":
-            value = (left >> right) & 0xFFFF
-        else:
-            raise ValueError(f"Unknown operator: {operator}")
-    else:
-        raise ValueError(f"Invalid instruction format: {instruction}")
-
-    # Ensure 16-bit range
-    value = value & 0xFFFF
-    cache[wire] = value
-    return value
+        if parts[1] not in OPERATORS:
+            raise ValueError(f"Unknown operator: {parts[1]}")
+        return OPERATORS[parts[1]], parts[0], parts[2]
+    raise ValueError(f"Invalid instruction format: {instruction}")
+
+
+def _operand(operand: Optional[str], index: Dict[str, int]) -> int:
+    """The number of the wire, or ~c for a constant c"""
+    if operand is None:
+        return ~0
+    if operand.isdigit():
+        return ~int(operand)
+    if operand not in index:
+        raise ValueError(f"No instruction found for wire {operand}")
+    return index[operand]
+
+
+def topological_order(left: list[int], right: list[int]) -> list[int]:
+    """The wires, numbered by their position in left and right (which hold
+    their operands), in an order in which every wire comes after its inputs"""
+    missing_inputs = [0] * len(left)
+    dependents: list[list[int]] = [[] for _ in left]
+    for wire, operands in enumerate(zip(left, right)):
+        for source in operands:
+            if source >= 0:
+                dependents[source].append(wire)
+                missing_inputs[wire] += 1
+
+    order = [wire for wire, missing in enumerate(missing_inputs) if missing == 0]
+    for wire in order:  # order grows while we go through it
+        for dependent in dependents[wire]:
+            missing_inputs[dependent] -= 1
+            if missing_inputs[dependent] == 0:
+                order.append(dependent)
+    if len(order) < len(left):
+        raise ValueError("Circuit contains a loop")
+    return order
+
+
+class Circuit:
+    """A circuit compiled into flat tables of gate codes and operands.
+
+    The wires are numbered in topological order, so a single pass from the
+    first wire to the last evaluates the whole circuit, however deep it is.
+    An operand is the number of a wire, or a constant c stored as ~c (which
+    is negative).
+
+    set_wire drives a wire with a fixed signal and only re-evaluates the wires
+    downstream of it, in topological order, stopping wherever a signal does
+    not change.
+    """
+
+    def __init__(self, instructions: Dict[str, str]):
+        gates = [parse_gate(source) for source in instructions.values()]
+        index = {wire: i for i, wire in enumerate(instructions)}
+        left = [_operand(gate[1], index) for gate in gates]
+        right = [_operand(gate[2], index) for gate in gates]
+        order = topological_order(left, right)
+
+        position = [0] * len(order)
+        for i, wire in enumerate(order):
+            position[wire] = i
+        wires = list(instructions)
+        self.names = [wires[wire] for wire in order]
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.gates = [gates[wire][0] for wire in order]
+        self.left = [left[w] if left[w] < 0 else position[left[w]] for w in order]
+        self.right = [right[w] if right[w] < 0 else position[right[w]] for w in order]
+        self.dependents: list[list[int]] = [[] for _ in order]
+        for wire, operands in enumerate(zip(self.left, self.right)):
+            for source in set(operands):
+                if source >= 0:
+                    self.dependents[source].append(wire)
+        self.values = [0] * len(order)
+        self.evaluate()
+
+    def evaluate(self) -> None:
+        values = self.values
+        for i, (gate, left, right) in enumerate(zip(self.gates, self.left, self.right)):
+            values[i] = OPERATIONS[gate](
+                values[left] if left >= 0 else ~left,
+                values[right] if right >= 0 else ~right,
+            )
+
+    def get_wire(self, wire: str) -> int:
+        if wire.isdigit():
+            return int(wire)
+        return self.values[self.index[wire]]
+
+    def set_wire(self, wire: str, value: int) -> None:
+        """Replace the instruction of the wire by the signal value, as in part
+        2, and bring the wires that depend on it up to date"""
+        if not 0 <= value <= MASK:
+            raise ValueError(f"Signal {value} does not fit in 16 bits")
+        i = self.index[wire]
+        self.gates[i], self.left[i], self.right[i] = ASSIGN, ~value, ~0
+        self._update(i)
+
+    def _update(self, first: int) -> None:
+        """Re-evaluate the wire and, in topological order, every wire whose
+        input changed as a result"""
+        values = self.values
+        queue = [first]
+        queued = {first}
+        while queue:
+            i = heappop(queue)
+            left, right = self.left[i], self.right[i]
+            value = OPERATIONS[self.gates[i]](
+                values[left] if left >= 0 else ~left,
+                values[right] if right >= 0 else ~right,
+            )
+            if value == values[i]:
+                continue
+            values[i] = value
+            for dependent in self.dependents[i]:
+                if dependent not in queued:
+                    queued.add(dependent)
+                    heappush(queue, dependent)
 
 
 def solve_part1(fname: str) -> int:
     """Solve part 1: find signal on wire 'a'"""
-    instructions = parse(fname)
-    cache = {}
-    return evaluate_wire("a", instructions, cache)
+    return Circuit(parse(fname)).get_wire("a")
 
 
 def solve_part2(fname: str) -> int:
     """Solve part 2: override wire 'b' with part 1 result, then find new 'a'"""
-    instructions = parse(fname)
+    circuit = Circuit(parse(fname))
+
+    # Override wire 'b' with the original value of wire 'a'; only the wires
+    # downstream of 'b' are evaluated again
+    circuit.set_wire("b", circuit.get_wire("a"))
+    return circuit.get_wire("a")
+
 
-    # First, get the original value of wire 'a'
-    cache = {}
-    original_a = evaluate_wire("a", instructions, cache)
+@solution(7, 1)
+def run_part1():
+    return solve_part1("day07.txt")
 
-    # Override wire 'b' with the original 'a' value
-    instructions["b"] = str(original_a)
 
-    # Clear cache and compute new 'a'
-    cache = {}
-    return evaluate_wire("a", instructions, cache)
+@solution(7, 2)
+def run_part2():
+    return solve_part2("day07.txt")
 
 
 if __name__ == "__main__":
     # Test with example
     print("Testing with example:")
-    test_instructions = parse("test_day07.txt")
-    test_cache = {}
+    test_circuit = Circuit(parse("test_day07.txt"))
 
     expected = {
         "d": 72,
@@ -111,7 +211,7 @@ if __name__ == "__main__":
 
     print("Expected vs Actual:")
     for wire, expected_value in expected.items():
-        actual = evaluate_wire(wire, test_instructions, test_cache)
+        actual = test_circuit.get_wire(wire)
         print(
             f"{wire}: {expected_value} vs {actual} {'✓' if expected_value == actual else '✗'}"
         )
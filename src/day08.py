@@ -1,35 +1,46 @@
-from utils.file_utils import read_file
+from utils.file_utils import map_file
+from utils.registry import solution
 
 
 def part1(fname):
-    lines = read_file(fname)
     raw = 0
     in_memory = 0
     # Process the lines to extract the relevant information
-    for line in lines:
-        raw += len(line)
-        in_memory += len(eval(line))
-        # print(
-        #     f"Processing line: {line}, length: {len(line) - 2}, evaluated length: {len(eval(line))}, running raw: {raw}, in-memory: {in_memory}"
-        # )
-    print(f"Raw length: {raw}, in-memory length: {in_memory} --> {raw - in_memory}")
+    with map_file(fname) as lines:
+        for line in lines:
+            raw += len(line)
+            in_memory += len(eval(line))
+            # print(
+            #     f"Processing line: {line}, length: {len(line) - 2}, evaluated length: {len(eval(line))}, running raw: {raw}, in-memory: {in_memory}"
+            # )
+    return raw - in_memory
 
 
 def part2(fname):
-    lines = read_file(fname)
     raw = 0
     encoded = 0
     # Process the lines to extract the relevant information
-    for line in lines:
-        raw += len(line)
-        # every quotation mark or backslash incurs and extra character, plus two additional quotation marks to encode the string itself
-        encoded += len(line) + line.count('"') + line.count("\\") + 2
-        # print(
-        #     f"Processing line: {line}, length: {len(line) - 2}, encoded length: {encoded}, running raw: {raw}, encoded: {encoded}"
-        # )
-    print(f"Raw length: {raw}, encoded length: {encoded} --> {encoded - raw}")
+    with map_file(fname) as lines:
+        for line in lines:
+            raw += len(line)
+            # every quotation mark or backslash incurs and extra character, plus two additional quotation marks to encode the string itself
+            encoded += len(line) + line.count('"') + line.count("\\") + 2
+            # print(
+            #     f"Processing line: {line}, length: {len(line) - 2}, encoded length: {encoded}, running raw: {raw}, encoded: {encoded}"
+            # )
+    return encoded - raw
+
+
+@solution(8, 1)
+def run_part1():
+    return part1("day08.txt")
+
+
+@solution(8, 2)
+def run_part2():
+    return part2("day08.txt")
 
 
 if __name__ == "__main__":
-    part1("day08.txt")
-    part2("day08.txt")
+    print(f"Raw minus in-memory length: {part1('day08.txt')}")
+    print(f"Encoded minus raw length: {part2('day08.txt')}")
@@ -1,15 +1,16 @@
-from utils.file_utils import read_file
+from utils.file_utils import map_file
+from utils.registry import solution
 
 
 def parse(fname):
-    lines = read_file(fname)
     # Process the lines to extract the relevant information
     data = {}
-    for line in lines:
-        cities, *distance = line.split(" = ")
-        c0, c1 = cities.split(" to ")
-        data[(c0, c1)] = int(distance[0])
-        data[(c1, c0)] = int(distance[0])
+    with map_file(fname) as lines:
+        for line in lines:
+            cities, *distance = line.split(" = ")
+            c0, c1 = cities.split(" to ")
+            data[(c0, c1)] = int(distance[0])
+            data[(c1, c0)] = int(distance[0])
     return data
 
 
@@ -42,6 +43,16 @@ def part2(fname):
     return max_distance
 
 
+@solution(9, 1)
+def run_part1():
+    return part1("day09.txt")
+
+
+@solution(9, 2)
+def run_part2():
+    return part2("day09.txt")
+
+
 if __name__ == "__main__":
     print(part1("day09.txt"))
     print(part2("day09.txt"))
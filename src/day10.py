@@ -1,5 +1,7 @@
 import re
+from utils.registry import solution
 
+INPUT = "1113222113"
 PATTERN = re.compile(r"((.)\2*)")
 
 
@@ -20,7 +22,16 @@ def part2(s):
     return len(s)
 
 
+@solution(10, 1)
+def run_part1():
+    return part1(INPUT)
+
+
+@solution(10, 2)
+def run_part2():
+    return part2(INPUT)
+
+
 if __name__ == "__main__":
-    input_data = "1113222113"
-    print(part1(input_data))
-    print(part2(input_data))
+    print(part1(INPUT))
+    print(part2(INPUT))
@@ -1,5 +1,7 @@
 import re
+from utils.registry import solution
 
+INPUT = "cqjxjnds"
 PASSWORD_CHARS = "abcdefghjkmnpqrstuvwxyz"
 PATTERN = re.compile(r"(.)\1.*(.)\2")
 
@@ -69,8 +71,18 @@ def find_next_password(s: str) -> str:
     return s
 
 
+@solution(11, 1)
+def run_part1():
+    return find_next_password(INPUT)
+
+
+@solution(11, 2)
+def run_part2():
+    return find_next_password(find_next_password(INPUT))
+
+
 if __name__ == "__main__":
-    input_data = "cqjxjnds"
+    input_data = INPUT
     next_password = find_next_password(input_data)
     print(f"Next valid password after '{input_data}': {next_password}")
     print(f"Is '{next_password}' a valid password? {is_valid_password(next_password)}")
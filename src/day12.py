@@ -1,6 +1,7 @@
 import re
 import json
 from utils.file_utils import read_raw_file
+from utils.registry import solution
 
 PATTERN = re.compile(r"-?\d+")
 
@@ -41,6 +42,16 @@ def sum_numbers_excluding_red(data) -> int:
     return sum_numbers(json.dumps(filtered_data))
 
 
+@solution(12, 1)
+def run_part1():
+    return sum_numbers(read_raw_file("day12.txt"))
+
+
+@solution(12, 2)
+def run_part2():
+    return sum_numbers_excluding_red(json.loads(read_raw_file("day12.txt")))
+
+
 if __name__ == "__main__":
     input_data = read_raw_file("day12.txt")
     result = sum_numbers(input_data)
@@ -1,17 +1,19 @@
 from collections import defaultdict
 import re
-from utils.file_utils import read_file
+from utils.file_utils import map_file
 from itertools import permutations
+from utils.registry import solution
 
 PATTERN = re.compile(r"^(\w+) \w+ (\w+) (\d+) .* (\w+)\.$")
 
 
 def parse_rules(fname):
     rules = defaultdict(dict)
-    for line in read_file(fname):
-        matches = PATTERN.findall(line)[0]
-        val = int(matches[2]) * (1 if matches[1] == "gain" else -1)
-        rules[matches[0]][matches[3]] = val
+    with map_file(fname) as lines:
+        for line in lines:
+            matches = PATTERN.findall(line)[0]
+            val = int(matches[2]) * (1 if matches[1] == "gain" else -1)
+            rules[matches[0]][matches[3]] = val
     return rules
 
 
@@ -40,6 +42,16 @@ def part2(rules):
     return max_value
 
 
+@solution(13, 1)
+def run_part1():
+    return part1(parse_rules("day13.txt"))
+
+
+@solution(13, 2)
+def run_part2():
+    return part2(parse_rules("day13.txt"))
+
+
 if __name__ == "__main__":
     rules = parse_rules("day13.txt")
     print(part1(rules))
@@ -1,4 +1,5 @@
-from utils.file_utils import read_file
+from utils.file_utils import map_file
+from utils.registry import solution
 
 
 def parse(fname: str) -> dict[str, tuple[int, int, int]]:
@@ -7,13 +8,14 @@ def parse(fname: str) -> dict[str, tuple[int, int, int]]:
     flying time, and resting time.
     """
     reindeer = {}
-    for line in read_file(fname):
-        parts = line.split()
-        name = parts[0]
-        speed = int(parts[3])
-        fly_time = int(parts[6])
-        rest_time = int(parts[13])
-        reindeer[name] = (speed, fly_time, rest_time)
+    with map_file(fname) as lines:
+        for line in lines:
+            parts = line.split()
+            name = parts[0]
+            speed = int(parts[3])
+            fly_time = int(parts[6])
+            rest_time = int(parts[13])
+            reindeer[name] = (speed, fly_time, rest_time)
     return reindeer
 
 
@@ -47,6 +49,16 @@ def part2(reindeer):
     return max(points.values())
 
 
+@solution(14, 1)
+def run_part1():
+    return part1(parse("day14.txt"))
+
+
+@solution(14, 2)
+def run_part2():
+    return part2(parse("day14.txt"))
+
+
 if __name__ == "__main__":
     reindeer = parse("day14.txt")
     print(reindeer)
@@ -1,19 +1,21 @@
 # ruff: noqa: E741
 import re
-from utils.file_utils import read_file
+from utils.file_utils import map_file
+from utils.registry import solution
 
 
 def parse_input(fname):
     ingredients = {}
-    for line in read_file(fname):
-        match = re.match(r"(\w+): (.+)", line)
-        if match:
-            name = match.group(1)
-            properties = match.group(2).split(", ")
-            ingredients[name] = {}
-            for prop in properties:
-                key, value = prop.split(" ")
-                ingredients[name][key] = int(value)
+    with map_file(fname) as lines:
+        for line in lines:
+            match = re.match(r"(\w+): (.+)", line)
+            if match:
+                name = match.group(1)
+                properties = match.group(2).split(", ")
+                ingredients[name] = {}
+                for prop in properties:
+                    key, value = prop.split(" ")
+                    ingredients[name][key] = int(value)
     return ingredients
 
 
@@ -89,6 +91,16 @@ def part2(ingredients):
     return max_score
 
 
+@solution(15, 1)
+def run_part1():
+    return part1(parse_input("day15.txt"))
+
+
+@solution(15, 2)
+def run_part2():
+    return part2(parse_input("day15.txt"))
+
+
 if __name__ == "__main__":
     ingredients = parse_input("day15.txt")
     print(part1(ingredients))
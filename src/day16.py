@@ -1,5 +1,6 @@
-from utils.file_utils import read_file
+from utils.file_utils import map_file
 import re
+from utils.registry import solution
 
 aunt_sue_data = {
     "children": 3,
@@ -18,9 +19,10 @@ PATTERN = re.compile(r"(\w*): (\d+)")
 
 def parse_sues(fname):
     sues = dict()
-    for sue_number, line in enumerate(read_file(fname), start=1):
-        props = dict(PATTERN.findall(line))
-        sues[sue_number] = props
+    with map_file(fname) as lines:
+        for sue_number, line in enumerate(lines, start=1):
+            props = dict(PATTERN.findall(line))
+            sues[sue_number] = props
     return sues
 
 
@@ -46,6 +48,16 @@ def part2(sues):
     return None
 
 
+@solution(16, 1)
+def run_part1():
+    return part1(parse_sues("day16.txt"))
+
+
+@solution(16, 2)
+def run_part2():
+    return part2(parse_sues("day16.txt"))
+
+
 if __name__ == "__main__":
     sues = parse_sues("day16.txt")
     print(f"Part 1 - Exact matches: {part1(sues)}")
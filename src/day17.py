@@ -1,11 +1,13 @@
-from utils.file_utils import read_file
+from utils.file_utils import map_file
+from utils.registry import solution
 
 
 def parse(fname):
     data = []
-    for line in read_file(fname):
-        # Assuming each line is a number
-        data.append(int(line.strip()))
+    with map_file(fname) as lines:
+        for line in lines:
+            # Assuming each line is a number
+            data.append(int(line.strip()))
     return data
 
 
@@ -49,6 +51,18 @@ def part2(containers):
     return solutions
 
 
+@solution(17, 1)
+def run_part1():
+    return part1(parse("day17.txt"))
+
+
+@solution(17, 2)
+def run_part2():
+    solutions = part2(parse("day17.txt"))
+    min_containers = min(len(sol) for sol in solutions)
+    return sum(1 for sol in solutions if len(sol) == min_containers)
+
+
 if __name__ == "__main__":
     data = parse("day17.txt")
     print(f"Parsed data: {data}")
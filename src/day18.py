@@ -1,6 +1,7 @@
 from utils.file_utils import read_file
-from utils.aoc_utils import neighbours
+from utils.grid import Grid
 from copy import deepcopy
+from utils.registry import solution
 
 ON = "#"
 OFF = "."
@@ -11,54 +12,31 @@ def parse_input(file_path):
     return data
 
 
-def next_value(data, r, c, cell):
-    neighbours_on = sum(
-        1
-        for nr, nc in neighbours(r, c, len(data), len(data[0]), include_diagonals=True)
-        if data[nr][nc] == ON
-    )
-    if cell == ON:
-        return ON if neighbours_on in (2, 3) else OFF
-    else:
-        return ON if neighbours_on == 3 else OFF
-
-
-def part1(data):
-    for i in range(1, 101):
-        next_cycle = list()
-        for r, row in enumerate(data):
-            line = list()
-            for c, cell in enumerate(row):
-                line.append(next_value(data, r, c, cell))
-            next_cycle.append(line)
-        on_count = sum(cell == ON for row in next_cycle for cell in row)
-        print(f"After {i} cycles: {on_count} lights on")
-        data = next_cycle
-
-
-def part2(data):
-    max_dim = len(data) - 1
-    data[0][0] = ON
-    data[0][max_dim] = ON
-    data[max_dim][0] = ON
-    data[max_dim][max_dim] = ON
-
-    for i in range(1, 101):
-        next_cycle = list()
-        for r, row in enumerate(data):
-            line = list()
-            for c, cell in enumerate(row):
-                nv = (
-                    ON
-                    if r in (0, len(data) - 1) and c in (0, len(data[0]) - 1)
-                    else next_value(data, r, c, cell)
-                )
-                line.append(nv)
-            next_cycle.append(line)
-        # dump(next_cycle)
-        on_count = sum(cell == ON for row in next_cycle for cell in row)
-        print(f"After {i} cycles: {on_count} lights on")
-        data = next_cycle
+def next_generation(grid: Grid) -> Grid:
+    """Apply the rules to every light at once: a light that is on stays on with
+    2 or 3 neighbours on, a light that is off turns on with exactly 3"""
+    neighbours_on = grid.neighbour_counts(include_diagonals=True)
+    return Grid((neighbours_on == 3) | (grid.cells & (neighbours_on == 2)), grid.edges)
+
+
+def corners_on(grid: Grid) -> Grid:
+    grid.cells[[0, 0, -1, -1], [0, -1, 0, -1]] = True
+    return grid
+
+
+def part1(data, cycles=100):
+    grid = Grid.from_lines(data, on=ON)
+    for _ in range(cycles):
+        grid = next_generation(grid)
+    return grid.count()
+
+
+def part2(data, cycles=100):
+    grid = corners_on(Grid.from_lines(data, on=ON))
+    for _ in range(cycles):
+        grid = corners_on(next_generation(grid))
+        # dump(grid.to_lines(ON, OFF))
+    return grid.count()
 
 
 def dump(data):
@@ -67,6 +45,16 @@ def dump(data):
     print()
 
 
+@solution(18, 1)
+def run_part1():
+    return part1(parse_input("day18.txt"))
+
+
+@solution(18, 2)
+def run_part2():
+    return part2(parse_input("day18.txt"))
+
+
 if __name__ == "__main__":
     input_data = parse_input("day18.txt")
     print(f"Part 1: {part1(deepcopy(input_data))}")
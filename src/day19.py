@@ -1,5 +1,6 @@
 from collections import defaultdict
 from utils.file_utils import read_file
+from utils.registry import solution
 
 
 def parse(fname):
@@ -71,6 +72,17 @@ def part1(replacements, molecule):
     return len(generated)
 
 
+@solution(19, 1)
+def run_part1():
+    return part1(*parse("day19.txt"))
+
+
+@solution(19, 2)
+def run_part2():
+    replacements, molecule = parse("day19.txt")
+    return part2(generate_backward_replacements(replacements), molecule)
+
+
 if __name__ == "__main__":
     replacements, molecule = parse("day19.txt")
     print(f"Replacements: {replacements}")
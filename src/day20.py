@@ -1,4 +1,10 @@
 from math import sqrt
+from typing import Callable
+
+from utils.registry import solution
+
+TARGET = 33_100_000
+LIMIT = 1_000_000
 
 
 def divisors(n: int) -> set[int]:
@@ -19,26 +25,34 @@ def limited_presents(housenumber: int) -> int:
     return 11 * sum(d for d in divisors(housenumber) if housenumber // d <= 50)
 
 
+def first_house(
+    count_presents: Callable[[int], int], target: int = TARGET, limit: int = LIMIT
+) -> int:
+    """Lowest house number below limit that gets at least target presents"""
+    for i in range(1, limit):
+        if count_presents(i) >= target:
+            return i
+    raise ValueError(f"No house below {limit} gets {target} presents")
+
+
 def part1() -> str:
-    n = 33_100_000
-    print("====================================================")
-    for i in range(1, 1_000_000):
-        if presents(i) >= n:
-            return f"Solved for {i}, presents(i) = {presents(i)}"
-        if i % 500_000 == 0:
-            print(i, presents(i))
-    return "No solution could be found"
+    i = first_house(presents)
+    return f"Solved for {i}, presents(i) = {presents(i)}"
 
 
 def part2() -> str:
-    n = 33_100_000
-    print("====================================================")
-    for i in range(1, 1_000_000):
-        if limited_presents(i) >= n:
-            return f"Solved for {i}, limited_presents(i) = {limited_presents(i)}"
-        if i % 100_000 == 0:
-            print(i, limited_presents(i))
-    return "No solution could be found"
+    i = first_house(limited_presents)
+    return f"Solved for {i}, limited_presents(i) = {limited_presents(i)}"
+
+
+@solution(20, 1)
+def run_part1() -> int:
+    return first_house(presents)
+
+
+@solution(20, 2)
+def run_part2() -> int:
+    return first_house(limited_presents)
 
 
 if __name__ == "__main__":
@@ -1,6 +1,7 @@
 from itertools import combinations
 from typing import NamedTuple, List
-import os
+from utils.file_utils import map_file
+from utils.registry import solution
 
 
 class Item(NamedTuple):
@@ -139,14 +140,13 @@ def part2(boss_hp: int, boss_damage: int, boss_armor: int) -> int:
 
 def parse_boss_stats(filename: str = "day21.txt") -> tuple[int, int, int]:
     """Parse boss stats from input file."""
-    filepath = os.path.join("/workspaces/aoc-2015/data", filename)
-    with open(filepath) as f:
-        lines = f.read().strip().split("\n")
-
     stats = {}
-    for line in lines:
-        key, value = line.split(": ")
-        stats[key] = int(value)
+    with map_file(filename) as lines:
+        for line in lines:
+            if not line:
+                continue
+            key, value = line.split(": ")
+            stats[key] = int(value)
 
     return stats["Hit Points"], stats["Damage"], stats["Armor"]
 
@@ -167,5 +167,15 @@ def main():
     print(f"Part 2 - Maximum gold to lose: {part2(boss_hp, boss_damage, boss_armor)}")
 
 
+@solution(21, 1)
+def run_part1():
+    return part1(*parse_boss_stats())
+
+
+@solution(21, 2)
+def run_part2():
+    return part2(*parse_boss_stats())
+
+
 if __name__ == "__main__":
     main()
@@ -1,12 +1,15 @@
 try:
     # when running as script with src on PYTHONPATH
     from utils.file_utils import read_file
+    from utils.aoc_utils import PriorityDict
+    from utils.registry import solution
 except ModuleNotFoundError:  # pragma: no cover
     # Fallback when tests import via 'from src.day22 import ...'
     from src.utils.file_utils import read_file
+    from src.utils.aoc_utils import PriorityDict
+    from src.utils.registry import solution
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
-from heapq import heappush, heappop
 import os
 import sys
 
@@ -193,12 +196,23 @@ def solve_combat(
         is_player_turn=True,
     )
 
-    # Priority queue: (mana_spent, state)
-    pq = [(0, initial_state)]
+    # Priority queue: state -> mana_spent, holding only the cheapest known way
+    # to reach each state (states compare equal regardless of mana spent)
+    pq = PriorityDict({initial_state: 0})
     visited = set()
 
+    def push(new_state: GameState):
+        if hash(new_state) in visited:
+            return
+        known = pq.get(new_state)
+        if known is None or new_state.mana_spent < known:
+            # Re-insert so the key itself is the cheaper state
+            pq.pop(new_state, None)
+            pq[new_state] = new_state.mana_spent
+
     while pq:
-        current_mana, state = heappop(pq)
+        state = pq.pop_smallest()
+        current_mana = state.mana_spent
 
         # Skip if we've seen this state with less mana
         state_key = hash(state)
@@ -244,7 +258,7 @@ def solve_combat(
 
                 # Switch to boss turn
                 new_state.is_player_turn = False
-                heappush(pq, (new_state.mana_spent, new_state))
+                push(new_state)
 
         else:
             # Boss's turn - attack player
@@ -260,7 +274,7 @@ def solve_combat(
 
             # Switch to player turn
             new_state.is_player_turn = True
-            heappush(pq, (new_state.mana_spent, new_state))
+            push(new_state)
 
     return None  # No solution found
 
@@ -432,5 +446,15 @@ def main():
     print(f"Part 2 - Minimum mana to win (hard mode): {result2}")
 
 
+@solution(22, 1)
+def run_part1():
+    return part1("day22.txt")
+
+
+@solution(22, 2)
+def run_part2():
+    return part2("day22.txt")
+
+
 if __name__ == "__main__":
     main()
@@ -1,4 +1,5 @@
 from utils.file_utils import read_file
+from utils.registry import solution
 
 
 class TuringLock:
@@ -40,6 +41,14 @@ class TuringLock:
         return f"TuringLock(pc={self.pc}, registers={self.registers})"
 
 
+def run_program(pgm, a=0, b=0):
+    """Run the program to completion and return the final registers"""
+    lock = TuringLock(pgm, a, b)
+    while lock.step():
+        pass
+    return lock.registers
+
+
 def parse_input(filename):
     instructions = []
     data = read_file(filename)
@@ -50,6 +59,16 @@ def parse_input(filename):
     return instructions
 
 
+@solution(23, 1)
+def run_part1():
+    return run_program(parse_input("day23.txt"))["b"]
+
+
+@solution(23, 2)
+def run_part2():
+    return run_program(parse_input("day23.txt"), a=1)["b"]
+
+
 if __name__ == "__main__":
     instructions = parse_input("day23.txt")
     print(instructions)
@@ -1,10 +1,12 @@
-from utils.file_utils import read_file
+from utils.file_utils import map_file
 from itertools import combinations
 from math import prod
+from utils.registry import solution
 
 
 def parse(fname):
-    return [int(line) for line in read_file(fname)]
+    with map_file(fname, convert=int) as weights:
+        return list(weights)
 
 
 def find_valid_3_partitions(weights):
@@ -220,6 +222,23 @@ def best_first_group_min_qe_groups(
     return None
 
 
+def _min_quantum_entanglement(weights: list[int], groups: int) -> int:
+    best = best_first_group_min_qe_groups(weights, groups=groups)
+    if best is None:
+        raise ValueError(f"No valid {groups}-way partition of the packages")
+    return prod(best)
+
+
+@solution(24, 1)
+def run_part1():
+    return _min_quantum_entanglement(parse("day24.txt"), groups=3)
+
+
+@solution(24, 2)
+def run_part2():
+    return _min_quantum_entanglement(parse("day24.txt"), groups=4)
+
+
 if __name__ == "__main__":
     weights = parse("day24.txt")
     total = sum(weights)
@@ -4,6 +4,7 @@ Day 25: Let It Snow
 """
 
 from utils.file_utils import read_raw_file
+from utils.registry import solution
 
 
 def get_position_for_coordinates(row, col):
@@ -87,5 +88,10 @@ def main():
     print(f"Part 1: {result1}")
 
 
+@solution(25, 1)
+def run_part1():
+    return solve_part1(read_raw_file("day25.txt"))
+
+
 if __name__ == "__main__":
     main()
@@ -1,9 +1,22 @@
 """Module implementing miscellaneous utility functions for ramblings in AoC, 2024"""
 
-from heapq import heapify, heappush, heappop
+import multiprocessing
+import os
 
 DIRECTIONS = [(-1, 0), (1, 0), (0, -1), (0, 1)]
 ALL_DIRECTIONS = [(-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (-1, 1), (1, -1), (1, 1)]
+JOBS_ENV = "AOC_JOBS"
+
+
+def default_jobs() -> int:
+    """Number of worker processes for a solution that runs on a pool of them:
+    AOC_JOBS if set, else one per CPU; inside a worker process of a pool
+    already (e.g. under aoc -j N) a single one, so the pools do not multiply"""
+    if jobs := os.environ.get(JOBS_ENV):
+        return int(jobs)
+    if multiprocessing.parent_process() is not None:
+        return 1
+    return os.cpu_count() or 1
 
 
 def manhattan_distance(x: tuple[int, int], y: tuple[int, int]) -> int:
@@ -16,8 +29,12 @@ class PriorityDict(dict):
     Keys of the dictionary are items to be put into the queue, and values
     are their respective priorities. All dictionary methods work as expected.
     The advantage over a standard heapq-based priority queue is
-    that priorities of items can be efficiently updated (amortized O(1))
-    using code as 'thedict[item] = new_priority.'
+    that priorities of items can be efficiently updated (O(log n), both
+    decrease-key and increase-key) using code as 'thedict[item] = new_priority.'
+
+    The keys are kept in an indexed d-ary heap that records the position of
+    every key, so updates and deletions move the key in place: the heap never
+    holds stale entries and never grows beyond the size of the dictionary.
 
     The 'smallest' method can be used to return the object with lowest
     priority, and 'pop_smallest' also removes it.
@@ -25,13 +42,60 @@ class PriorityDict(dict):
     The 'sorted_iter' method provides a destructive sorted iterator.
     """
 
+    ARITY = 4
+
     def __init__(self, *args, **kwargs):
         super(PriorityDict, self).__init__(*args, **kwargs)
         self._rebuild_heap()
 
     def _rebuild_heap(self):
-        self._heap = [(v, k) for k, v in self.items()]
-        heapify(self._heap)
+        self._heap = list(self.keys())
+        self._position = {k: i for i, k in enumerate(self._heap)}
+        for i in range((len(self._heap) - 2) // self.ARITY, -1, -1):
+            self._sift_down(i)
+
+    def _sift_up(self, i):
+        heap, position = self._heap, self._position
+        key = heap[i]
+        val = self[key]
+        while i > 0:
+            parent = (i - 1) // self.ARITY
+            parent_key = heap[parent]
+            if not val < self[parent_key]:
+                break
+            heap[i] = parent_key
+            position[parent_key] = i
+            i = parent
+        heap[i] = key
+        position[key] = i
+
+    def _sift_down(self, i):
+        heap, position = self._heap, self._position
+        size = len(heap)
+        key = heap[i]
+        val = self[key]
+        while (first := self.ARITY * i + 1) < size:
+            child, child_val = first, self[heap[first]]
+            for c in range(first + 1, min(first + self.ARITY, size)):
+                if (c_val := self[heap[c]]) < child_val:
+                    child, child_val = c, c_val
+            if not child_val < val:
+                break
+            heap[i] = heap[child]
+            position[heap[i]] = i
+            i = child
+        heap[i] = key
+        position[key] = i
+
+    def _remove_from_heap(self, key):
+        heap, position = self._heap, self._position
+        i = position.pop(key)
+        last = heap.pop()
+        if i < len(heap):
+            heap[i] = last
+            position[last] = i
+            self._sift_up(i)
+            self._sift_down(position[last])
 
     def smallest(self):
         """Return the item with the lowest priority.
@@ -39,12 +103,7 @@ class PriorityDict(dict):
         Raises IndexError if the object is empty.
         """
 
-        heap = self._heap
-        v, k = heap[0]
-        while k not in self or self[k] != v:
-            heappop(heap)
-            v, k = heap[0]
-        return k
+        return self._heap[0]
 
     def pop_smallest(self):
         """Return the item with the lowest priority and remove it.
@@ -52,25 +111,52 @@ class PriorityDict(dict):
         Raises IndexError if the object is empty.
         """
 
-        heap = self._heap
-        v, k = heappop(heap)
-        while k not in self or self[k] != v:
-            v, k = heappop(heap)
-        del self[k]
-        return k
+        key = self._heap[0]
+        del self[key]
+        return key
 
     def __setitem__(self, key, val):
-        # We are not going to remove the previous value from the heap,
-        # since this would have a cost O(n).
+        if key in self:
+            old_val = self[key]
+            super(PriorityDict, self).__setitem__(key, val)
+            if val < old_val:
+                self._sift_up(self._position[key])
+            else:
+                self._sift_down(self._position[key])
+        else:
+            super(PriorityDict, self).__setitem__(key, val)
+            self._heap.append(key)
+            self._position[key] = len(self._heap) - 1
+            self._sift_up(len(self._heap) - 1)
 
-        super(PriorityDict, self).__setitem__(key, val)
+    def __delitem__(self, key):
+        super(PriorityDict, self).__delitem__(key)
+        self._remove_from_heap(key)
 
-        if len(self._heap) < 2 * len(self):
-            heappush(self._heap, (val, key))
-        else:
-            # When the heap grows larger than 2 * len(self), we rebuild it
-            # from scratch to avoid wasting too much memory.
-            self._rebuild_heap()
+    def pop(self, key, *default):
+        if key not in self:
+            return super(PriorityDict, self).pop(key, *default)
+        val = self[key]
+        del self[key]
+        return val
+
+    def popitem(self):
+        """Remove and return the (item, priority) pair with the lowest priority.
+
+        Raises KeyError if the object is empty.
+        """
+        if not self:
+            raise KeyError("popitem(): dictionary is empty")
+        key = self._heap[0]
+        return key, self.pop(key)
+
+    def clear(self):
+        super(PriorityDict, self).clear()
+        self._heap.clear()
+        self._position.clear()
+
+    def copy(self):
+        return PriorityDict(self)
 
     def setdefault(self, key, val):
         if key not in self:
@@ -85,6 +171,12 @@ class PriorityDict(dict):
 
         super(PriorityDict, self).update(*args, **kwargs)
         self._rebuild_heap()
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def sorted_iter(self):
         """Sorted iterator of the priority dictionary items.
         Beware: this will destroy elements as they are returned.
         """
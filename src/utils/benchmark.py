@@ -0,0 +1,74 @@
+"""Timing and baseline bookkeeping for the performance regression benchmarks"""
+
+import json
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Callable, Optional
+
+from utils.file_utils import PROJECT_ROOT
+
+BASELINES_FILE = PROJECT_ROOT / "tests" / "benchmark_baselines.json"
+DEFAULT_THRESHOLD = 1.5
+# Don't bother repeating anything that takes longer than this (in seconds)
+REPEAT_LIMIT = 1.0
+
+
+def measure(
+    func: Callable[..., Any],
+    *args,
+    rounds: int = 3,
+    setup: Optional[Callable[[], Any]] = None,
+) -> tuple[float, Any]:
+    """Call func(*args) up to rounds times and return the best wall time along
+    with the result of the last call; slow functions are only run once. setup
+    runs before every round, outside the timing"""
+    if rounds < 1:
+        raise ValueError(f"Need at least one round, got {rounds}")
+    best, result = float("inf"), None
+    for _ in range(rounds):
+        if setup is not None:
+            setup()
+        start = perf_counter()
+        result = func(*args)
+        best = min(best, perf_counter() - start)
+        if best > REPEAT_LIMIT:
+            break
+    return best, result
+
+
+class Baselines:
+    """Benchmark name -> reference time in seconds, kept in a JSON file. The
+    times are specific to the machine, so the file is not committed"""
+
+    def __init__(self, path: Path = BASELINES_FILE):
+        self.path = path
+        self.changed = False
+        try:
+            with open(path) as f:
+                self.times: dict[str, float] = json.load(f)
+        except FileNotFoundError:
+            self.times = {}
+
+    def get(self, name: str) -> float | None:
+        return self.times.get(name)
+
+    def record(self, name: str, seconds: float) -> None:
+        self.times[name] = seconds
+        self.changed = True
+
+    def regression(
+        self, name: str, seconds: float, threshold: float = DEFAULT_THRESHOLD
+    ) -> str | None:
+        """Describe the regression if seconds exceeds threshold times the baseline"""
+        baseline = self.get(name)
+        if baseline is None or seconds <= threshold * baseline:
+            return None
+        return (
+            f"{name} took {seconds:.4f}s, {seconds / baseline:.2f}x its baseline "
+            f"of {baseline:.4f}s (threshold {threshold}x)"
+        )
+
+    def save(self) -> None:
+        with open(self.path, "w") as f:
+            json.dump(dict(sorted(self.times.items())), f, indent=2)
+            f.write("\n")
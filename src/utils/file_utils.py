@@ -1,5 +1,14 @@
+import mmap
 import os
-from typing import Any, Callable, Optional
+import tomllib
+from collections.abc import Iterator, Sequence
+from functools import lru_cache
+from itertools import batched
+from pathlib import Path
+from typing import Any, Callable, Optional, overload
+
+import numpy as np
+from numpy.typing import NDArray
 
 """Module implementing miscellaneous utility functions for ramblings in AoC, 2024"""
 
@@ -9,45 +18,258 @@ def toint(s: str):
     return int(s)
 
 
-def read_raw_file(filename: str, directory: str = "/workspaces/aoc-2015/data") -> str:
-    """Parse input file, return a list of stripped lines; if separator is
-    specified, break up the individual lines on the separator as well
+def project_root(module_path: Path = Path(__file__)) -> Path:
+    """The checkout this module lives in, recognised by its pyproject.toml; when
+    installed as a regular (non-editable) package it lives inside site-packages
+    instead, and the current directory is taken to be the project root"""
+    root = module_path.resolve().parents[2]
+    return root if (root / "pyproject.toml").is_file() else Path.cwd()
+
+
+DATA_DIR_ENV = "AOC_DATA_DIR"
+PROJECT_ROOT = project_root()
+INPUT_CACHE_SIZE = 64
+# Inputs larger than this (in bytes) are read afresh every time instead of
+# being kept in the cache, so big inputs are not held twice or kept alive
+INPUT_CACHE_MAX_FILE_SIZE = 1 << 22
+READ_CHUNK_SIZE = 1 << 20
+
+
+def data_directory() -> str:
+    """Resolve the directory holding the puzzle inputs: the AOC_DATA_DIR
+    environment variable wins, then 'data-dir' under [tool.aoc] in the project's
+    pyproject.toml (relative to the project root), then the project's data folder
+    """
+    if env_dir := os.environ.get(DATA_DIR_ENV):
+        return env_dir
+    return _configured_data_directory()
+
+
+@lru_cache(maxsize=1)
+def _configured_data_directory() -> str:
+    try:
+        with open(PROJECT_ROOT / "pyproject.toml", "rb") as f:
+            config = tomllib.load(f).get("tool", {}).get("aoc", {})
+    except FileNotFoundError:
+        config = {}
+    return str(PROJECT_ROOT / config.get("data-dir", "data"))
+
+
+def input_path(filename: str, directory: Optional[str] = "") -> str:
+    """Full path of an input file. An empty directory (the default everywhere)
+    means the resolved data directory, None means filename is a path already
     """
-    filepath = filename if directory is None else os.path.join(directory, filename)
+    if directory is None:
+        return filename
+    return os.path.join(directory or data_directory(), filename)
+
+
+def _raw_file(filepath: str) -> str:
     with open(filepath) as f:  # pylint: disable=C0103
-        content = f.read()
-    return content
+        return f.read()
+
+
+def _parsed_file(
+    filepath: str,
+    separator: Optional[str],
+    convert: Optional[Callable[[str], Any]],
+) -> list[Any]:
+    """Decode the whole file at once and split it in bulk; the per-line views
+    of MappedLines only pay off when not every line is needed"""
+    with open(filepath, "rb") as f:
+        lines = f.read().decode().split("\n")
+    # Like readlines(), do not report an empty last line
+    if not lines[-1]:
+        lines.pop()
+    lines = [line.strip() for line in lines]
+    if separator is None:
+        return lines if convert is None else list(map(convert, lines))
+    fields = [field for line in lines for field in line.split(separator)]
+    return fields if convert is None else list(map(convert, fields))
+
+
+@lru_cache(maxsize=INPUT_CACHE_SIZE)
+def _cached_raw_file(filepath: str, mtime_ns: int) -> str:
+    return _raw_file(filepath)
+
+
+@lru_cache(maxsize=INPUT_CACHE_SIZE)
+def _cached_file(
+    filepath: str,
+    mtime_ns: int,
+    separator: Optional[str],
+    convert: Optional[Callable[[str], Any]],
+) -> tuple[Any, ...]:
+    return tuple(_parsed_file(filepath, separator, convert))
+
+
+def clear_input_cache() -> None:
+    """Drop all inputs kept by read_file and read_raw_file"""
+    _cached_raw_file.cache_clear()
+    _cached_file.cache_clear()
+
+
+def read_raw_file(filename: str, directory: Optional[str] = "") -> str:
+    """Return the full contents of the input file. Contents of files up to
+    INPUT_CACHE_MAX_FILE_SIZE are cached per process, keyed on path and
+    modification time
+    """
+    filepath = input_path(filename, directory)
+    stat = os.stat(filepath)
+    if stat.st_size > INPUT_CACHE_MAX_FILE_SIZE:
+        return _raw_file(filepath)
+    return _cached_raw_file(filepath, stat.st_mtime_ns)
+
+
+class MappedLines(Sequence[Any]):
+    """Read-only view over the lines of a memory-mapped file.
+
+    Iterating decodes the mapping a block of lines at a time, so memory use
+    does not depend on the size of the file. For len() and indexing, the
+    offsets of the line breaks are indexed on first use, and a line is sliced
+    out of the mapping, decoded and stripped when it is requested. If a
+    separator is given, every line is returned as a list of fields; the
+    convert function is applied to every line (or field) on access.
+    """
+
+    def __init__(
+        self,
+        filepath: str,
+        separator: Optional[str] = None,
+        convert: Optional[Callable[[str], Any]] = None,
+    ):
+        self.separator = separator
+        self.convert = convert
+        with open(filepath, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            # mmap refuses to map empty files
+            self._buffer = (
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+            )
+        self._line_starts: Optional[NDArray[np.int64]] = None
+
+    @property
+    def _starts(self) -> NDArray[np.int64]:
+        if self._line_starts is None:
+            self._line_starts = self._index_lines(self._buffer)
+        return self._line_starts
+
+    @staticmethod
+    def _index_lines(buffer) -> NDArray[np.int64]:
+        """Offsets at which the lines start, with the buffer length appended as
+        a sentinel; follows readlines() in not reporting an empty last line.
+        All newlines are found in one vectorized pass over the buffer."""
+        size = len(buffer)
+        newlines = np.flatnonzero(np.frombuffer(buffer, dtype=np.uint8) == ord("\n"))
+        starts = np.concatenate(([0], newlines + 1)).astype(np.int64)
+        if starts[-1] != size:
+            starts = np.append(starts, size)
+        return starts
+
+    def _line(self, index: int) -> Any:
+        start, end = self._starts[index : index + 2].tolist()
+        return self._parse(self._buffer[start:end])
+
+    def _parse(self, line: bytes) -> Any:
+        return self._split(line.decode().strip())
+
+    def _split(self, text: str) -> Any:
+        if self.separator is None:
+            return text if self.convert is None else self.convert(text)
+        fields = text.split(self.separator)
+        return fields if self.convert is None else [self.convert(f) for f in fields]
+
+    def __len__(self) -> int:
+        return len(self._starts) - 1
+
+    @overload
+    def __getitem__(self, index: int) -> Any: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[Any]: ...
+
+    def __getitem__(self, index: int | slice) -> Any:
+        if isinstance(index, slice):
+            return [self._line(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("line index out of range")
+        return self._line(index)
+
+    def __iter__(self) -> Iterator[Any]:
+        # Decoded a block of READ_CHUNK_SIZE bytes (up to a line break) at a time
+        buffer, start = self._buffer, 0
+        while start < len(buffer):
+            end = buffer.find(b"\n", start + READ_CHUNK_SIZE - 1) + 1 or len(buffer)
+            lines = buffer[start:end].decode().split("\n")
+            if not lines[-1]:
+                lines.pop()
+            for line in lines:
+                yield self._split(line.strip())
+            start = end
+
+    def fields(self) -> Iterator[Any]:
+        """Iterate over all (converted) fields of all lines, i.e. the flattened
+        sequence that read_file returns when a separator is specified"""
+        for item in self:
+            if self.separator is None:
+                yield item
+            else:
+                yield from item
+
+    def close(self) -> None:
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+
+    def __enter__(self) -> "MappedLines":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def map_file(
+    filename: str,
+    directory: Optional[str] = "",
+    separator: Optional[str] = None,
+    convert: Optional[Callable[[str], Any]] = None,
+) -> MappedLines:
+    """Memory-map the input file and return a lazy line view on it; close it
+    (or use it as a context manager) when done
+    """
+    filepath = input_path(filename, directory)
+    return MappedLines(filepath, separator=separator, convert=convert)
+
+
+def map_raw_file(filename: str, directory: Optional[str] = "") -> mmap.mmap | bytes:
+    """Memory-map the input file read-only and return the mapping itself, for
+    solvers that can work on the raw bytes without decoding them first
+    """
+    filepath = input_path(filename, directory)
+    with open(filepath, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b""
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
 
 
 def read_file(
     filename: str,
-    directory: str = "/workspaces/aoc-2015/data",
+    directory: Optional[str] = "",
     separator: Optional[str] = None,
     convert: Optional[Callable[[str], Any]] = None,
 ) -> list[str] | list[Any]:
     """Parse input file, return a list of stripped lines; if separator is
-    specified, break up the individual lines on the separator as well
+    specified, break up the individual lines on the separator as well. Parsed
+    inputs of files up to INPUT_CACHE_MAX_FILE_SIZE are cached per process,
+    keyed on path, modification time, separator and convert function; every
+    call returns a fresh list
     """
-    filepath = filename if directory is None else os.path.join(directory, filename)
-    with open(filepath) as f:  # pylint: disable=C0103
-        content = f.readlines()
-    if separator is None:
-        if convert is None:
-            result = [line.strip() for line in content]
-        else:
-            result = [convert(line.strip()) for line in content]
-    else:
-        if convert is None:
-            result = [
-                field for line in content for field in line.strip().split(separator)
-            ]
-        else:
-            result = [
-                convert(field)
-                for line in content
-                for field in line.strip().split(separator)
-            ]
-    return result
+    filepath = input_path(filename, directory)
+    stat = os.stat(filepath)
+    if stat.st_size > INPUT_CACHE_MAX_FILE_SIZE:
+        return _parsed_file(filepath, separator, convert)
+    return list(_cached_file(filepath, stat.st_mtime_ns, separator, convert))
 
 
 def binary_to_int(binary_number: str) -> int:
@@ -59,27 +281,57 @@ def id(s: Any) -> Any:
     return s
 
 
+def _read_line_chunks(filepath: str, chunk_size: int) -> Iterator[list[str]]:
+    """Read the file in large blocks and yield the complete lines of every
+    block; a line that straddles two blocks is carried over to the next one
+    """
+    with open(filepath) as f:
+        # Pieces of the line being carried over, only joined once it ends, so
+        # a very long line is not copied again for every block
+        tail: list[str] = []
+        while chunk := f.read(chunk_size):
+            lines = chunk.split("\n")
+            if len(lines) == 1:
+                tail.append(chunk)
+                continue
+            if tail:
+                tail.append(lines[0])
+                lines[0] = "".join(tail)
+            tail = [lines.pop()]
+            yield lines
+        if last := "".join(tail):
+            yield [last]
+
+
 def read_file_g(
     filename: str,
-    directory: str = "/workspaces/aoc-2015/data",
+    directory: Optional[str] = "",
     separator: Optional[str] = None,
     convert: Callable[[str], Any] = id,
-) -> Any:
+    batch_size: Optional[int] = None,
+    chunk_size: int = READ_CHUNK_SIZE,
+) -> Iterator[Any]:
     """Attempting a more fluent, pipelined approach using generators. If a separator
-    is specified, the line will be separated. All atoms will be converted using
-    the convert function.
+    is specified, the line will be separated into a list of fields. All atoms will
+    be converted using the convert function. The file is read in blocks of
+    chunk_size characters up to EOF (blank lines included), so memory use does not
+    depend on the file size; with a batch_size, tuples of up to that many lines are
+    yielded instead of single lines.
     """
-    filepath = filename if directory is None else os.path.join(directory, filename)
-    with open(filepath) as f:
-        continue_reading = True
-        while continue_reading:
-            line = f.readline().strip()
-            continue_reading = line != ""
-            if continue_reading:
-                if separator is None:
-                    yield convert(line)
-                else:
-                    yield map(convert, line.split(separator))
+    filepath = input_path(filename, directory)
+    lines = (
+        line.strip()
+        for chunk in _read_line_chunks(filepath, chunk_size)
+        for line in chunk
+    )
+    if separator is None:
+        items = map(convert, lines)
+    else:
+        items = ([convert(f) for f in line.split(separator)] for line in lines)
+    if batch_size is None:
+        yield from items
+    else:
+        yield from batched(items, batch_size)
 
 
 def manhattan_distance(x: tuple[int, int], y: tuple[int, int]) -> int:
@@ -0,0 +1,440 @@
+"""Synthetic puzzle inputs at arbitrary scale, for stress testing the solutions.
+
+Every generator takes a NumPy random generator and a size (whose meaning depends
+on the day: characters, lines, wires, cities, ...) and returns the text of a
+valid input file for that day. Equal seeds give equal inputs.
+
+    python -m utils.generators 3 --size 100000000 -o /tmp/inputs
+    python -m utils.generators 6 --size 1000 --option grid_size=100000
+"""
+
+import argparse
+import inspect
+import json
+import os
+import string
+from typing import Any, Callable
+
+import numpy as np
+
+Generator = Callable[..., str]
+
+# day -> (generator, default size)
+GENERATORS: dict[int, tuple[Generator, int]] = {}
+DEFAULT_SEED = 2015
+
+
+def generator(day: int, default_size: int) -> Callable[[Generator], Generator]:
+    def register(func: Generator) -> Generator:
+        GENERATORS[day] = (func, default_size)
+        return func
+
+    return register
+
+
+def generate(
+    day: int, size: int | None = None, seed: int = DEFAULT_SEED, **options
+) -> str:
+    """Text of a synthetic input for the given day; options are passed on to
+    the day's generator"""
+    func, default_size = GENERATORS[day]
+    rng = np.random.default_rng(seed)
+    return func(rng, default_size if size is None else size, **options)
+
+
+def write_input(
+    day: int,
+    directory: str,
+    size: int | None = None,
+    seed: int = DEFAULT_SEED,
+    **options,
+) -> str:
+    """Write a synthetic input as directory/dayNN.txt and return its path"""
+    path = os.path.join(directory, f"day{day:02d}.txt")
+    with open(path, "w") as f:
+        f.write(generate(day, size, seed, **options))
+    return path
+
+
+def _symbols(rng: np.random.Generator, alphabet: bytes, size: int) -> str:
+    """Random string of size symbols from alphabet, built without a Python loop
+    and in a single byte per symbol"""
+    indices = rng.integers(0, len(alphabet), size, dtype=np.uint8).tobytes()
+    return indices.translate(alphabet.ljust(256, b"\0")).decode()
+
+
+def _word(rng: np.random.Generator, length: int) -> str:
+    return _symbols(rng, string.ascii_lowercase.encode(), length)
+
+
+def _names(count: int, capitalize: bool = True) -> list[str]:
+    """count distinct alphabetic names: a, b, ..., z, ba, bb, ..."""
+    names = []
+    for i in range(count):
+        name = ""
+        while True:
+            i, digit = divmod(i, 26)
+            name = string.ascii_lowercase[digit] + name
+            if i == 0:
+                break
+        names.append(name.capitalize() if capitalize else name)
+    return names
+
+
+def _lines(lines: list[str]) -> str:
+    return "\n".join(lines)
+
+
+@generator(1, 7000)
+def day01(rng: np.random.Generator, size: int) -> str:
+    return _symbols(rng, b"()", size)
+
+
+@generator(2, 1000)
+def day02(rng: np.random.Generator, size: int) -> str:
+    dims = rng.integers(1, 31, (size, 3))
+    return _lines([f"{length}x{width}x{height}" for length, width, height in dims])
+
+
+@generator(3, 8192)
+def day03(rng: np.random.Generator, size: int) -> str:
+    return _symbols(rng, b"^v<>", size)
+
+
+@generator(4, 8)
+def day04(rng: np.random.Generator, size: int) -> str:
+    """The secret key, of size letters"""
+    return _word(rng, size)
+
+
+@generator(5, 1000)
+def day05(rng: np.random.Generator, size: int) -> str:
+    return _lines([_word(rng, 16) for _ in range(size)])
+
+
+@generator(6, 300)
+def day06(rng: np.random.Generator, size: int, grid_size: int = 1000) -> str:
+    actions = rng.choice(["turn on", "turn off", "toggle"], size)
+    corners = np.sort(rng.integers(0, grid_size, (size, 2, 2)), axis=1)
+    return _lines(
+        [
+            f"{action} {x0},{y0} through {x1},{y1}"
+            for action, ((x0, y0), (x1, y1)) in zip(actions, corners)
+        ]
+    )
+
+
+@generator(7, 339)
+def day07(rng: np.random.Generator, size: int) -> str:
+    """A circuit of size wires: 'b' and some others are driven by a signal, the
+    rest by gates on wires defined before them, and 'a' is the last one"""
+    others = [n for n in _names(size + 2, capitalize=False) if n not in ("a", "b")]
+    names = ["b"] + others
+    names = names[: size - 1] + ["a"]
+    lines = [f"{rng.integers(0, 1 << 16)} -> b"]
+    for i in range(1, size):
+        # mostly wires defined recently, so the circuit gets deep
+        x, y = (names[max(0, i - int(d))] for d in rng.geometric(0.3, 2))
+        match rng.integers(0, 8):
+            case 0:
+                source = f"NOT {x}"
+            case 1:
+                source = f"{x} AND {y}"
+            case 2:
+                source = f"1 AND {x}"
+            case 3:
+                source = f"{x} OR {y}"
+            case 4:
+                source = f"{x} LSHIFT {rng.integers(1, 16)}"
+            case 5:
+                source = f"{x} RSHIFT {rng.integers(1, 16)}"
+            case 6:
+                source = str(rng.integers(0, 1 << 16))
+            case _:
+                source = x
+        lines.append(f"{source} -> {names[i]}")
+    rng.shuffle(lines)
+    return _lines(lines)
+
+
+@generator(8, 300)
+def day08(rng: np.random.Generator, size: int) -> str:
+    lines = []
+    for _ in range(size):
+        parts = []
+        for _ in range(rng.integers(1, 30)):
+            match rng.integers(0, 10):
+                case 0:
+                    parts.append('\\"')
+                case 1:
+                    parts.append("\\\\")
+                case 2:
+                    parts.append(f"\\x{rng.integers(0, 256):02x}")
+                case _:
+                    parts.append(_word(rng, 1))
+        lines.append('"' + "".join(parts) + '"')
+    return _lines(lines)
+
+
+@generator(9, 8)
+def day09(rng: np.random.Generator, size: int) -> str:
+    """Distances between every pair of size cities"""
+    cities = _names(size)
+    return _lines(
+        [
+            f"{c0} to {c1} = {rng.integers(1, 200)}"
+            for i, c0 in enumerate(cities)
+            for c1 in cities[i + 1 :]
+        ]
+    )
+
+
+@generator(10, 10)
+def day10(rng: np.random.Generator, size: int) -> str:
+    return _symbols(rng, b"123", size)
+
+
+@generator(11, 8)
+def day11(rng: np.random.Generator, size: int) -> str:
+    return _word(rng, size)
+
+
+@generator(12, 5000)
+def day12(rng: np.random.Generator, size: int) -> str:
+    """A JSON array of size // 64 values, nested up to 8 levels deep"""
+
+    def value(budget: int, depth: int) -> Any:
+        kind = rng.integers(0, 4) if budget > 1 and depth < 8 else rng.integers(2, 4)
+        if kind < 2:
+            children = [
+                value(budget // 4, depth + 1) for _ in range(rng.integers(1, 5))
+            ]
+            if kind == 0:
+                return children
+            return dict(zip(_names(len(children), capitalize=False), children))
+        if kind == 2:
+            return int(rng.integers(-50, 200))
+        return str(rng.choice(["red", "green", "blue", "orange", "violet"]))
+
+    values = [value(64, 0) for _ in range(max(1, size // 64))]
+    return json.dumps(values, separators=(",", ":"))
+
+
+@generator(13, 8)
+def day13(rng: np.random.Generator, size: int) -> str:
+    people = _names(size)
+    lines = []
+    for person in people:
+        for neighbour in people:
+            if neighbour != person:
+                units = int(rng.integers(-100, 101))
+                verb = "gain" if units >= 0 else "lose"
+                lines.append(
+                    f"{person} would {verb} {abs(units)} happiness units "
+                    f"by sitting next to {neighbour}."
+                )
+    return _lines(lines)
+
+
+@generator(14, 9)
+def day14(rng: np.random.Generator, size: int) -> str:
+    return _lines(
+        [
+            f"{name} can fly {rng.integers(5, 30)} km/s for {rng.integers(2, 20)} "
+            f"seconds, but then must rest for {rng.integers(20, 170)} seconds."
+            for name in _names(size)
+        ]
+    )
+
+
+@generator(15, 4)
+def day15(rng: np.random.Generator, size: int) -> str:
+    properties = ["capacity", "durability", "flavor", "texture"]
+    return _lines(
+        [
+            f"{name}: "
+            + ", ".join(f"{p} {rng.integers(-3, 6)}" for p in properties)
+            + f", calories {rng.integers(1, 9)}"
+            for name in _names(size)
+        ]
+    )
+
+
+@generator(16, 500)
+def day16(rng: np.random.Generator, size: int) -> str:
+    """size Sues with three compounds each; one of them (at a random position)
+    matches the MFCSAM reading exactly"""
+    from day16 import aunt_sue_data
+
+    compounds = list(aunt_sue_data)
+    match = rng.integers(0, size)
+    lines = []
+    for sue in range(size):
+        chosen = rng.choice(compounds, 3, replace=False)
+        if sue == match:
+            amounts = [aunt_sue_data[c] for c in chosen]
+        else:
+            amounts = rng.integers(0, 11, 3)
+        props = ", ".join(f"{c}: {a}" for c, a in zip(chosen, amounts))
+        lines.append(f"Sue {sue + 1}: {props}")
+    return _lines(lines)
+
+
+@generator(17, 20)
+def day17(rng: np.random.Generator, size: int) -> str:
+    return _lines([str(c) for c in rng.integers(5, 51, size)])
+
+
+@generator(18, 100)
+def day18(rng: np.random.Generator, size: int) -> str:
+    """A size x size grid of lights"""
+    return _lines([_symbols(rng, b"#.", size) for _ in range(size)])
+
+
+@generator(19, 200)
+def day19(rng: np.random.Generator, size: int) -> str:
+    """Replacement rules over a dozen elements, and a molecule made from 'e' in
+    about size replacement steps"""
+    elements = ["H", "O", "Al", "B", "Ca", "F", "Mg", "N", "P", "Si", "Th", "Ti"]
+    rules = [("e", "".join(rng.choice(elements, 2))) for _ in range(3)]
+    for element in elements:
+        for _ in range(rng.integers(1, 4)):
+            rules.append((element, element + str(rng.choice(elements))))
+    molecule = _split_elements(str(rng.choice([after for _, after in rules[:3]])))
+    for _ in range(size):
+        position = rng.integers(0, len(molecule))
+        options = [after for before, after in rules if before == molecule[position]]
+        molecule[position : position + 1] = _split_elements(str(rng.choice(options)))
+    lines = [f"{before} => {after}" for before, after in rules]
+    return _lines(lines + ["", "".join(molecule)])
+
+
+def _split_elements(molecule: str) -> list[str]:
+    elements = []
+    for c in molecule:
+        if c.islower() and elements:
+            elements[-1] += c
+        else:
+            elements.append(c)
+    return elements
+
+
+@generator(20, 33_100_000)
+def day20(rng: np.random.Generator, size: int) -> str:
+    """The number of presents, which is the size itself"""
+    return str(size)
+
+
+@generator(21, 100)
+def day21(rng: np.random.Generator, size: int) -> str:
+    """Boss stats, with size hit points"""
+    damage, armor = rng.integers(4, 10), rng.integers(0, 4)
+    return f"Hit Points: {size}\nDamage: {damage}\nArmor: {armor}"
+
+
+@generator(22, 51)
+def day22(rng: np.random.Generator, size: int) -> str:
+    """Boss stats, with size hit points"""
+    return f"Hit Points: {size}\nDamage: {rng.integers(7, 11)}"
+
+
+@generator(23, 48)
+def day23(rng: np.random.Generator, size: int) -> str:
+    """A program of size instructions that only ever jumps forward, so it halts"""
+    lines = []
+    for i in range(size):
+        register = rng.choice(["a", "b"])
+        offset = int(rng.integers(1, max(2, min(10, size - i + 1))))
+        match rng.integers(0, 6):
+            case 0:
+                lines.append(f"hlf {register}")
+            case 1:
+                lines.append(f"tpl {register}")
+            case 2 | 3:
+                lines.append(f"inc {register}")
+            case 4:
+                lines.append(f"jmp +{offset}")
+            case _:
+                lines.append(f"{rng.choice(['jie', 'jio'])} {register}, +{offset}")
+    return _lines(lines)
+
+
+@generator(24, 29)
+def day24(rng: np.random.Generator, size: int) -> str:
+    """At least size distinct package weights that can be split into 3 as well
+    as into 4 groups of equal weight: they are made up of 12 equal-weight
+    buckets (of which 4 or 3 form a group)"""
+    per_bucket = max(2, -(-size // 12))
+    bucket_weight = per_bucket * per_bucket * 40
+    weights: set[int] = set()
+    buckets = 0
+    while buckets < 12:
+        high = 2 * bucket_weight // per_bucket
+        bucket = [int(w) for w in rng.integers(1, high, per_bucket - 1)]
+        last = bucket_weight - sum(bucket)
+        bucket.append(last)
+        if last > 0 and len(set(bucket)) == per_bucket and not weights & set(bucket):
+            weights.update(bucket)
+            buckets += 1
+    return _lines([str(w) for w in sorted(weights)])
+
+
+@generator(25, 3000)
+def day25(rng: np.random.Generator, size: int) -> str:
+    """Coordinates of a code somewhere in the first size rows and columns"""
+    row, column = rng.integers(1, size + 1, 2)
+    return (
+        "To continue, please consult the code grid in the manual.  "
+        f"Enter the code at row {row}, column {column}."
+    )
+
+
+def generator_options(day: int) -> list[str]:
+    """Names of the options the day's generator takes, besides rng and size"""
+    func, _ = GENERATORS[day]
+    return list(inspect.signature(func).parameters)[2:]
+
+
+def _option(text: str) -> tuple[str, Any]:
+    """A KEY=VALUE generator option from the command line; the value is read as
+    JSON if it can be, so numbers come out as numbers"""
+    key, separator, value = text.partition("=")
+    if not separator or not key:
+        raise argparse.ArgumentTypeError(f"expected KEY=VALUE, got {text!r}")
+    try:
+        return key, json.loads(value)
+    except json.JSONDecodeError:
+        return key, value
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Generate synthetic puzzle inputs")
+    parser.add_argument("days", nargs="+", type=int)
+    parser.add_argument("--size", type=int, help="scale of the input (per day)")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument(
+        "--option",
+        type=_option,
+        action="append",
+        default=[],
+        metavar="KEY=VALUE",
+        help="option passed on to the generators, e.g. grid_size=100000 for day 6",
+    )
+    parser.add_argument("-o", "--output", default=".", help="directory to write to")
+    args = parser.parse_args(argv)
+    options = dict(args.option)
+    # Check everything up front, so a bad option does not stop halfway
+    for day in args.days:
+        if day not in GENERATORS:
+            parser.error(f"no generator for day {day}")
+        if unknown := sorted(set(options) - set(generator_options(day))):
+            parser.error(
+                f"day {day} takes no option {', '.join(unknown)} "
+                f"(options: {', '.join(generator_options(day)) or 'none'})"
+            )
+    for day in args.days:
+        print(write_input(day, args.output, args.size, args.seed, **options))
+
+
+if __name__ == "__main__":
+    main()
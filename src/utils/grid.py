@@ -0,0 +1,77 @@
+"""Array-backed grids for the cellular-automaton style puzzles in AoC, 2015
+
+Instead of asking for the neighbours of one cell at a time (see
+aoc_utils.neighbours), the neighbour counts of the whole grid are computed at
+once by summing shifted copies of the grid, one per neighbour offset.
+"""
+
+from typing import Iterable
+
+import numpy as np
+from numpy.typing import NDArray
+
+from utils.aoc_utils import ALL_DIRECTIONS, DIRECTIONS
+
+ORTHOGONAL_OFFSETS = np.array(DIRECTIONS, dtype=np.intp)
+ALL_OFFSETS = np.array(ALL_DIRECTIONS, dtype=np.intp)
+
+BOUNDED = "bounded"
+TOROIDAL = "toroidal"
+
+
+def neighbour_counts(
+    cells: NDArray,
+    include_diagonals: bool = False,
+    edges: str = BOUNDED,
+) -> NDArray[np.uint8]:
+    """Count the non-zero neighbours of every cell in a single pass.
+
+    With bounded edges, cells beyond the border count as empty; with toroidal
+    edges the grid wraps around in both directions.
+    """
+    offsets = ALL_OFFSETS if include_diagonals else ORTHOGONAL_OFFSETS
+    values = (cells != 0).view(np.uint8)
+    counts = np.zeros(cells.shape, dtype=np.uint8)
+    rows, cols = cells.shape
+    if edges == TOROIDAL:
+        for dr, dc in offsets:
+            counts += np.roll(values, (-dr, -dc), axis=(0, 1))
+    elif edges == BOUNDED:
+        padded = np.pad(values, 1)
+        for dr, dc in offsets:
+            counts += padded[1 + dr : 1 + dr + rows, 1 + dc : 1 + dc + cols]
+    else:
+        raise ValueError(f"Unknown edge mode: {edges}")
+    return counts
+
+
+class Grid:
+    """Two-dimensional grid of cells that are either on or off"""
+
+    def __init__(self, cells: NDArray[np.bool_], edges: str = BOUNDED):
+        self.cells = cells
+        self.edges = edges
+
+    @classmethod
+    def from_lines(
+        cls, lines: Iterable[str], on: str = "#", edges: str = BOUNDED
+    ) -> "Grid":
+        cells = np.array([[c == on for c in line] for line in lines], dtype=np.bool_)
+        return cls(cells, edges)
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return self.cells.shape
+
+    def neighbour_counts(self, include_diagonals: bool = False) -> NDArray[np.uint8]:
+        return neighbour_counts(self.cells, include_diagonals, self.edges)
+
+    def count(self) -> int:
+        """Number of cells that are on"""
+        return int(np.count_nonzero(self.cells))
+
+    def copy(self) -> "Grid":
+        return Grid(self.cells.copy(), self.edges)
+
+    def to_lines(self, on: str = "#", off: str = ".") -> list[str]:
+        return ["".join(on if cell else off for cell in row) for row in self.cells]
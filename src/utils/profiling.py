@@ -0,0 +1,110 @@
+"""Profilers for the runner's --profile option.
+
+Each profiler runs a solution once and leaves its findings next to each other
+in the profile directory, named after the day and part:
+
+    cprofile      deterministic profile in NAME.pstats (snakeviz, pstats, ...)
+    tracemalloc   allocation snapshot in NAME.tracemalloc, top allocating lines
+    sample        stack samples every few milliseconds, in the collapsed format
+                  flamegraph.pl and speedscope read (NAME.collapsed)
+
+A summary of the top hot spots goes to stderr.
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import signal
+import sys
+import tracemalloc
+from collections import Counter
+from types import FrameType
+from typing import Any, Callable, Optional
+
+MODES = ("cprofile", "tracemalloc", "sample")
+SAMPLE_INTERVAL = 0.002
+
+
+def profile_cprofile(solve: Callable[[], Any], path: str, top: int) -> Any:
+    profiler = cProfile.Profile()
+    result = profiler.runcall(solve)
+    profiler.dump_stats(f"{path}.pstats")
+    report = io.StringIO()
+    pstats.Stats(profiler, stream=report).sort_stats("tottime").print_stats(top)
+    print(report.getvalue(), file=sys.stderr)
+    return result
+
+
+def profile_tracemalloc(solve: Callable[[], Any], path: str, top: int) -> Any:
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    try:
+        result = solve()
+        snapshot = tracemalloc.take_snapshot()
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+    snapshot.dump(f"{path}.tracemalloc")
+    for stat in snapshot.statistics("lineno")[:top]:
+        print(stat, file=sys.stderr)
+    return result
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{code.co_qualname}"
+
+
+def profile_sample(solve: Callable[[], Any], path: str, top: int) -> Any:
+    """Sample the stack on a CPU-time timer; only frames below this call count"""
+    stacks: Counter[str] = Counter()
+    base = sys._getframe()
+
+    def sample(signum: int, frame: Optional[FrameType]) -> None:
+        labels = []
+        while frame is not None and frame is not base:
+            labels.append(_frame_label(frame))
+            frame = frame.f_back
+        stacks[";".join(reversed(labels))] += 1
+
+    previous_handler = signal.signal(signal.SIGPROF, sample)
+    signal.setitimer(signal.ITIMER_PROF, SAMPLE_INTERVAL, SAMPLE_INTERVAL)
+    try:
+        result = solve()
+    finally:
+        signal.setitimer(signal.ITIMER_PROF, 0)
+        signal.signal(signal.SIGPROF, previous_handler)
+
+    with open(f"{path}.collapsed", "w") as f:
+        for stack, count in stacks.items():
+            f.write(f"{stack} {count}\n")
+    own_samples: Counter[str] = Counter()
+    for stack, count in stacks.items():
+        own_samples[stack.rpartition(";")[2]] += count
+    total = sum(own_samples.values()) or 1
+    for label, count in own_samples.most_common(top):
+        print(f"{count / total:7.1%} {count:8d}  {label}", file=sys.stderr)
+    return result
+
+
+PROFILERS = {
+    "cprofile": profile_cprofile,
+    "tracemalloc": profile_tracemalloc,
+    "sample": profile_sample,
+}
+
+
+def profiled(
+    mode: str, solve: Callable[[], Any], directory: str, name: str, top: int = 15
+) -> Callable[[], Any]:
+    """Wrap solve, so calling it runs it under the given profiler"""
+    profiler = PROFILERS[mode]
+
+    def run() -> Any:
+        os.makedirs(directory, exist_ok=True)
+        print(f"== {mode} profile of {name}", file=sys.stderr)
+        return profiler(solve, os.path.join(directory, name), top)
+
+    return run
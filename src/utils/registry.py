@@ -0,0 +1,36 @@
+"""Registry of the daily solutions, filled in by the day modules themselves"""
+
+import importlib
+from typing import Any, Callable, Iterable
+
+DAYS = range(1, 26)
+PARTS = (1, 2)
+
+# (day, part) -> function that reads its own input and returns the answer
+SOLUTIONS: dict[tuple[int, int], Callable[[], Any]] = {}
+
+
+def solution(day: int, part: int) -> Callable[[Callable[[], Any]], Callable[[], Any]]:
+    """Decorator registering the solution for one part of a day's puzzle"""
+
+    def register(func: Callable[[], Any]) -> Callable[[], Any]:
+        SOLUTIONS[(day, part)] = func
+        return func
+
+    return register
+
+
+def module_name(day: int) -> str:
+    return f"day{day:02d}"
+
+
+def discover(
+    days: Iterable[int] = DAYS, parts: Iterable[int] = PARTS
+) -> list[tuple[int, int]]:
+    """Import the modules of the given days, so that they register their
+    solutions, and return the registered (day, part) pairs in order
+    """
+    days, parts = set(days), set(parts)
+    for day in sorted(days):
+        importlib.import_module(module_name(day))
+    return sorted(key for key in SOLUTIONS if key[0] in days and key[1] in parts)
@@ -0,0 +1,296 @@
+"""Command line runner for the registered solutions, installed as 'aoc'.
+
+    aoc                 run every part of every day
+    aoc 1 4-6 -p 2      run part 2 of days 1, 4, 5 and 6
+    aoc 18 --json       report the results as JSON
+    aoc -j 8 --timeout 60
+                        run on 8 worker processes, giving up on parts after 60s
+    aoc 22 --profile sample
+                        profile day 22 (see utils.profiling), files in profiles/
+
+Every part is reported with its answer, wall time, CPU time and peak memory.
+Anything the solutions print goes to stderr, so stdout only carries the report.
+
+Wall times of successful parts are recorded (in .aoc-timings.json in the project
+root, or the file named by AOC_TIMINGS_FILE); parallel runs start the parts that
+took longest last time first, so the slowest ones do not end up at the back of
+the queue. Parts that were never timed are considered the slowest of all.
+"""
+
+import argparse
+import json
+import math
+import os
+import resource
+import signal
+import sys
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from time import perf_counter, process_time
+from typing import Any, Iterable, Optional
+
+from utils.file_utils import PROJECT_ROOT
+from utils.profiling import MODES, profiled
+from utils.registry import DAYS, PARTS, SOLUTIONS, discover
+
+TIMINGS_ENV = "AOC_TIMINGS_FILE"
+PROFILE_DIR = "profiles"
+
+
+@dataclass
+class PartResult:
+    """Outcome of running one part. CPU time includes that of the child
+    processes the part waited for. Peak memory is the peak of the traced
+    Python allocations when memory tracing is on, otherwise the peak resident
+    set size of the process while the part ran (on Linux; elsewhere the peak
+    of the process so far)"""
+
+    day: int
+    part: int
+    answer: Any
+    wall_time: float
+    cpu_time: float
+    peak_memory_kb: int
+    error: Optional[str] = None
+
+
+def _cpu_time() -> float:
+    """CPU time of this process and of its children that have finished"""
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return process_time() + children.ru_utime + children.ru_stime
+
+
+def _reset_peak_rss() -> bool:
+    """Start measuring a new peak resident set size; False where the system
+    does not support it (anything but Linux)"""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        return False
+    return True
+
+
+def _peak_rss_kb(was_reset: bool) -> int:
+    if was_reset:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _time_out(signum, frame):
+    raise TimeoutError("time limit exceeded")
+
+
+def run_part(
+    day: int,
+    part: int,
+    trace_memory: bool = False,
+    timeout: Optional[float] = None,
+    profile: Optional[str] = None,
+    profile_dir: str = PROFILE_DIR,
+    top: int = 15,
+) -> PartResult:
+    """Run one registered part; with a timeout (in seconds) the part is interrupted
+    by an alarm signal, so this must run in the main thread of its process. With
+    a profile mode, the part runs under that profiler (see utils.profiling)"""
+    solve = SOLUTIONS[(day, part)]
+    if profile:
+        solve = profiled(profile, solve, profile_dir, f"day{day:02d}-part{part}", top)
+    answer, error = None, None
+    previous_handler, peak_was_reset = None, False
+    if trace_memory:
+        tracemalloc.start()
+    else:
+        peak_was_reset = _reset_peak_rss()
+    if timeout:
+        previous_handler = signal.signal(signal.SIGALRM, _time_out)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    wall_start, cpu_start = perf_counter(), _cpu_time()
+    try:
+        with redirect_stdout(sys.stderr):
+            answer = solve()
+    except Exception as e:  # report the failure, keep running the other parts
+        error = f"{type(e).__name__}: {e}"
+    finally:
+        if timeout:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous_handler)
+    wall_time, cpu_time = perf_counter() - wall_start, _cpu_time() - cpu_start
+    if trace_memory:
+        peak_memory_kb = tracemalloc.get_traced_memory()[1] // 1024
+        tracemalloc.stop()
+    else:
+        peak_memory_kb = _peak_rss_kb(peak_was_reset)
+    return PartResult(day, part, answer, wall_time, cpu_time, peak_memory_kb, error)
+
+
+def _run_in_worker(day: int, part: int, *args, **kwargs) -> PartResult:
+    discover([day], [part])
+    return run_part(day, part, *args, **kwargs)
+
+
+def timings_file() -> Path:
+    return Path(os.environ.get(TIMINGS_ENV, PROJECT_ROOT / ".aoc-timings.json"))
+
+
+def timing_key(day: int, part: int) -> str:
+    return f"{day:02d}.{part}"
+
+
+def load_timings() -> dict[str, float]:
+    try:
+        with open(timings_file()) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def record_timings(results: list[PartResult]) -> None:
+    timings = load_timings()
+    for result in results:
+        if result.error is None:
+            timings[timing_key(result.day, result.part)] = result.wall_time
+    with open(timings_file(), "w") as f:
+        json.dump(dict(sorted(timings.items())), f, indent=2)
+
+
+def run_parallel(
+    tasks: list[tuple[int, int]],
+    jobs: Optional[int] = None,
+    trace_memory: bool = False,
+    timeout: Optional[float] = None,
+    **profile_options,
+) -> list[PartResult]:
+    """Run the (day, part) tasks on a pool of jobs worker processes, longest
+    expected first, and return their results in the order of tasks"""
+    expected = load_timings()
+    schedule = sorted(
+        tasks, key=lambda task: expected.get(timing_key(*task), math.inf), reverse=True
+    )
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = {
+            task: pool.submit(
+                _run_in_worker, *task, trace_memory, timeout, **profile_options
+            )
+            for task in schedule
+        }
+        results = []
+        for day, part in tasks:
+            try:
+                results.append(futures[(day, part)].result())
+            except Exception as e:  # e.g. a worker process that died
+                error = f"{type(e).__name__}: {e}"
+                results.append(PartResult(day, part, None, 0.0, 0.0, 0, error))
+        return results
+
+
+def run(
+    days: Iterable[int] = DAYS,
+    parts: Iterable[int] = PARTS,
+    trace_memory: bool = False,
+    jobs: int = 1,
+    timeout: Optional[float] = None,
+    **profile_options,
+) -> list[PartResult]:
+    """Run the registered parts of the given days, in process if jobs is 1,
+    otherwise on a process pool (of os.cpu_count() workers if jobs is 0).
+    Profile options (profile, profile_dir, top) are passed on to run_part."""
+    tasks = discover(days, parts)
+    if jobs == 1:
+        return [
+            run_part(day, part, trace_memory, timeout, **profile_options)
+            for day, part in tasks
+        ]
+    return run_parallel(tasks, jobs or None, trace_memory, timeout, **profile_options)
+
+
+def parse_days(specs: list[str]) -> list[int]:
+    """Turn arguments like '3' and '4-7' into a list of days"""
+    days = []
+    for spec in specs:
+        first, _, last = spec.partition("-")
+        days.extend(range(int(first), int(last or first) + 1))
+    return days
+
+
+def format_result(result: PartResult) -> str:
+    outcome = f"ERROR {result.error}" if result.error else result.answer
+    return (
+        f"Day {result.day:02d} part {result.part}: {outcome} "
+        f"(wall {result.wall_time:.3f}s, cpu {result.cpu_time:.3f}s, "
+        f"peak {result.peak_memory_kb} KiB)"
+    )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="aoc", description="Run Advent of Code 2015 solutions"
+    )
+    parser.add_argument(
+        "days", nargs="*", help="days or ranges of days to run (default: all)"
+    )
+    parser.add_argument(
+        "-p", "--part", type=int, choices=PARTS, action="append", dest="parts"
+    )
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    parser.add_argument(
+        "--trace-memory",
+        action="store_true",
+        help="measure peak memory per part with tracemalloc (slower)",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="number of worker processes, 0 for one per CPU (default: 1, in process)",
+    )
+    parser.add_argument("--timeout", type=float, help="time limit per part, in seconds")
+    parser.add_argument(
+        "--profile", choices=MODES, help="run every part under this profiler"
+    )
+    parser.add_argument(
+        "--profile-dir",
+        default=PROFILE_DIR,
+        help=f"where to write the profiles (default: {PROFILE_DIR})",
+    )
+    parser.add_argument(
+        "--top", type=int, default=15, help="number of hot spots to report"
+    )
+    return parser
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    days = parse_days(args.days) if args.days else DAYS
+    results = run(
+        days,
+        args.parts or PARTS,
+        args.trace_memory,
+        args.jobs,
+        args.timeout,
+        profile=args.profile,
+        profile_dir=args.profile_dir,
+        top=args.top,
+    )
+    if args.json:
+        print(json.dumps([asdict(r) for r in results], indent=2, default=str))
+    else:
+        for result in results:
+            print(format_result(result))
+    # The timings only help schedule later runs, so losing them is no failure
+    try:
+        record_timings(results)
+    except OSError as e:
+        print(f"warning: could not record timings: {e}", file=sys.stderr)
+    return 1 if any(r.error for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
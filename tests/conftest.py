@@ -0,0 +1,77 @@
+import pytest
+
+from day04 import CHECKPOINTS_ENV
+from utils.benchmark import DEFAULT_THRESHOLD, Baselines, measure
+from utils.file_utils import clear_input_cache
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("benchmark")
+    group.addoption(
+        "--benchmark",
+        action="store_true",
+        help="run the performance regression benchmarks",
+    )
+    group.addoption(
+        "--benchmark-update",
+        action="store_true",
+        help="store the measured times as the new baselines",
+    )
+    group.addoption(
+        "--benchmark-threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="fail benchmarks that take longer than this many times their baseline",
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "slow: test that takes a while to run")
+    config.addinivalue_line(
+        "markers", "benchmark: performance regression benchmark, needs --benchmark"
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--benchmark"):
+        return
+    skip = pytest.mark.skip(reason="benchmarks only run with --benchmark")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
+
+
+@pytest.fixture(scope="session")
+def baselines():
+    baselines = Baselines()
+    yield baselines
+    if baselines.changed:
+        baselines.save()
+
+
+@pytest.fixture
+def benchmark(request, baselines, tmp_path, monkeypatch):
+    """Time a call against the stored baseline for the requesting test. Tests
+    without a baseline record one; --benchmark-update overwrites them all.
+
+    Every round starts cold: without cached inputs, and without day 4
+    checkpoints to resume from."""
+    update = request.config.getoption("--benchmark-update")
+    threshold = request.config.getoption("--benchmark-threshold")
+    name = request.node.name
+    checkpoints = tmp_path / "day04-checkpoints.json"
+    monkeypatch.setenv(CHECKPOINTS_ENV, str(checkpoints))
+
+    def cold_start():
+        clear_input_cache()
+        checkpoints.unlink(missing_ok=True)
+
+    def bench(func, *args, rounds=3):
+        seconds, result = measure(func, *args, rounds=rounds, setup=cold_start)
+        if update or baselines.get(name) is None:
+            baselines.record(name, seconds)
+        elif message := baselines.regression(name, seconds, threshold):
+            pytest.fail(message)
+        return result
+
+    return bench
@@ -1,3 +1,6 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
 import utils.aoc_utils as u
 
 
@@ -38,3 +41,44 @@ def test_lists_equal_any_order():
     # Test with strings
     assert u.lists_equal_any_order(["a", "b", "c"], ["c", "a", "b"])
     assert not u.lists_equal_any_order(["a", "b"], ["a", "c"])
+
+
+def test_priority_dict_updates():
+    pd = u.PriorityDict({"a": 5, "b": 3, "c": 8})
+    assert pd.smallest() == "b"
+    pd["c"] = 1  # decrease-key
+    assert pd.smallest() == "c"
+    pd["c"] = 10  # increase-key
+    assert pd.smallest() == "b"
+    del pd["b"]
+    assert pd.pop_smallest() == "a"
+    assert len(pd._heap) == len(pd) == 1
+    assert pd.popitem() == ("c", 10)
+    assert pd.empty()
+
+
+def test_priority_dict_sorted_iter():
+    import random
+
+    rng = random.Random(2015)
+    pd = u.PriorityDict()
+    priorities = {}
+    for _ in range(1000):
+        key, val = rng.randrange(200), rng.randrange(10_000)
+        pd[key] = priorities[key] = val
+        if rng.random() < 0.1:
+            gone = rng.choice(list(priorities))
+            del pd[gone], priorities[gone]
+    assert len(pd._heap) == len(priorities)
+    assert [priorities[k] for k in pd.sorted_iter()] == sorted(priorities.values())
+    assert pd.empty()
+
+
+def test_default_jobs(monkeypatch):
+    monkeypatch.delenv(u.JOBS_ENV, raising=False)
+    assert u.default_jobs() == (os.cpu_count() or 1)
+    # A single worker inside the worker of a pool, e.g. under aoc -j N
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        assert pool.submit(u.default_jobs).result() == 1
+    monkeypatch.setenv(u.JOBS_ENV, "3")
+    assert u.default_jobs() == 3
@@ -0,0 +1,44 @@
+"""Performance regression benchmarks: every registered part on its real input,
+plus the solvers that should scale on large synthetic inputs. Only run with
+'pytest --benchmark'; see tests/conftest.py for the other options."""
+
+import pytest
+
+from utils.file_utils import DATA_DIR_ENV
+from utils.generators import write_input
+from utils.registry import PARTS, SOLUTIONS, discover
+
+# (day, size of the generated input)
+GENERATED = [
+    (1, 10**7),
+    (2, 10**5),
+    (3, 10**6),
+    (5, 10**5),
+    (6, 10**4),
+    (7, 10**5),
+    (8, 10**4),
+    (16, 10**5),
+    (18, 400),
+]
+
+# Every registered (day, part), found once for the parameters and their ids
+REGISTERED = discover()
+
+pytestmark = pytest.mark.benchmark
+
+
+@pytest.mark.parametrize(
+    "day, part", REGISTERED, ids=[f"day{d:02d}-part{p}" for d, p in REGISTERED]
+)
+def test_real_input(benchmark, day, part):
+    assert benchmark(SOLUTIONS[(day, part)]) is not None
+
+
+@pytest.mark.parametrize(
+    "day, size", GENERATED, ids=[f"day{d:02d}-{size}" for d, size in GENERATED]
+)
+def test_generated_input(benchmark, tmp_path, monkeypatch, day, size):
+    write_input(day, str(tmp_path), size)
+    monkeypatch.setenv(DATA_DIR_ENV, str(tmp_path))
+    discover([day])
+    benchmark(lambda: [SOLUTIONS[(day, part)]() for part in PARTS], rounds=1)
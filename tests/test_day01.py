@@ -0,0 +1,46 @@
+import mmap
+
+from day01 import basement, do_floor
+
+
+def test_do_floor():
+    assert do_floor("(())") == do_floor("()()") == 0
+    assert do_floor("))(((((") == 3
+    assert do_floor(b")())())") == -3
+    assert do_floor(memoryview(b"(()(()(\n"), chunk_size=3) == 3
+
+
+def test_basement():
+    assert basement(")") == 1
+    assert basement("()())") == 5
+    assert basement(b"((") == -1
+    # the basement is only reached in the third chunk
+    assert basement(b"(()" + b")" * 4, chunk_size=2) == 5
+
+
+def test_mmap(tmp_path):
+    path = tmp_path / "day01.txt"
+    path.write_bytes(b"(" * 1000 + b")" * 1001)
+    with open(path, "rb") as f:
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        assert do_floor(data, chunk_size=64) == -1
+        assert basement(data, chunk_size=64) == 2001
+
+
+def test_floor_index():
+    import numpy as np
+
+    from day01 import FloorIndex
+
+    rng = np.random.default_rng(1)
+    s = bytes(rng.choice(np.frombuffer(b"()", dtype=np.uint8), 5000))
+    index = FloorIndex(s, block_size=64)
+    floors = [0]
+    for c in s:
+        floors.append(floors[-1] + (1 if c == ord("(") else -1))
+    for position in [0, 1, 63, 64, 65, 1000, 4999, 5000]:
+        assert index.floor_at(position) == floors[position]
+    for floor in range(min(floors) - 1, max(floors) + 2):
+        expected = floors.index(floor) if floor in floors else -1
+        assert index.first_reach(floor) == expected
+    assert index.first_reach(-1) == basement(s)
@@ -1,4 +1,20 @@
-from day02 import wrap, ribbon
+import tracemalloc
+
+import numpy as np
+import pytest
+
+import day02
+from day02 import (
+    chunk_ranges,
+    parallel_totals,
+    parse_columns,
+    part1,
+    part2,
+    ribbon,
+    ribbon_total,
+    wrap,
+    wrap_total,
+)
 
 
 def test_wrap():
@@ -9,3 +25,89 @@ def test_wrap():
 def test_ribbon():
     assert ribbon(2, 3, 4) == 34
     assert ribbon(1, 1, 10) == 14
+
+
+def test_columns_match_scalar():
+    boxes = [tuple(box) for box in np.random.default_rng(2).integers(1, 40, (500, 3))]
+    raw = "\n".join(f"{length}x{width}x{height}" for length, width, height in boxes)
+    columns = parse_columns(raw + "\n")
+    assert [list(column) for column in columns] == [list(c) for c in zip(*boxes)]
+    assert wrap_total(*columns) == part1(boxes)
+    assert ribbon_total(*columns) == part2(boxes)
+    assert wrap_total(*parse_columns(b"2x3x4\r\n1x1x10")) == 58 + 43
+
+
+@pytest.mark.parametrize(
+    "raw",
+    [
+        "2x3x4\n1x1\n",
+        "2x3x4\n1x2x10x3\n5x5\n",
+        "2x3x4 1x1x1x1\n",
+        "2xx3x4\n",
+        "2x3x4\nax1x1\n",
+        "2x3x\n4x5x6 7\n",
+        "2x3\r4x5\n",
+        "x2x3\n",
+        "2x3 x4\n",
+        "2 3x4x5\n6x7\n",
+        "1x2x3\n4xx5\n6\n",
+        "4xx5\n6\n",
+        "2xx1\n2",
+        "1x2\nx3\n",
+        "1x2x3x\n",
+        "12\n",
+        "-1x2x3\n",
+    ],
+)
+def test_columns_reject_incomplete_box(raw):
+    with pytest.raises(ValueError):
+        parse_columns(raw)
+
+
+def test_columns_allow_blank_lines():
+    assert [len(column) for column in parse_columns("\n2x3x4\r\n\n1x1x10")] == [2] * 3
+    # Whitespace around a box is fine, as it was for process_data
+    columns = parse_columns("2x3x4 \n \t\n\t1x1x10\r\n")
+    assert [column.tolist() for column in columns] == [[2, 1], [3, 1], [4, 10]]
+    assert [len(column) for column in parse_columns(" \n\n")] == [0] * 3
+    assert [len(column) for column in parse_columns("")] == [0] * 3
+
+
+def _peak_memory(func, *args):
+    tracemalloc.start()
+    try:
+        func(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def test_columns_memory(monkeypatch):
+    monkeypatch.setattr(day02, "PARSE_CHUNK_SIZE", 1 << 14)
+    boxes = np.random.default_rng(4).integers(1, 40, (10**5, 3))
+    raw = "".join(f"{length}x{width}x{height}\n" for length, width, height in boxes)
+    temporaries = day02.PARSE_MEMORY_PER_BYTE * day02.PARSE_CHUNK_SIZE
+    # Totals only ever hold one chunk, columns the boxes of the whole input
+    assert _peak_memory(day02._totals, raw.encode()) < temporaries
+    assert 2 * _peak_memory(parse_columns, raw.encode()) < _peak_memory(
+        lambda: [tuple(map(int, line.split("x"))) for line in raw.splitlines()]
+    )
+
+
+def test_chunk_ranges_end_on_newlines():
+    raw = b"2x3x4\n1x1x10\n10x20x30"
+    ranges = chunk_ranges(raw, 4)
+    assert ranges == [(0, 6), (6, 13), (13, len(raw))]
+    assert chunk_ranges(raw, 100) == [(0, len(raw))]
+
+
+def test_parallel_totals(tmp_path):
+    boxes = [tuple(box) for box in np.random.default_rng(3).integers(1, 40, (300, 3))]
+    path = tmp_path / "day02.txt"
+    path.write_text(
+        "".join(f"{length}x{width}x{height}\n" for length, width, height in boxes)
+    )
+    assert parallel_totals(str(path), jobs=2, chunk_size=256) == (
+        part1(boxes),
+        part2(boxes),
+    )
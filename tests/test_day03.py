@@ -0,0 +1,86 @@
+import tracemalloc
+
+import numpy as np
+import pytest
+
+import day03
+from day03 import part1, part2, unique_houses
+
+
+def test_unique_houses():
+    assert unique_houses(">") == 2
+    assert unique_houses("^>v<") == 4
+    assert unique_houses("^v^v^v^v^v") == 2
+    assert unique_houses("") == 1
+
+
+@pytest.mark.parametrize("bitmap_max_cells", [0, day03.BITMAP_MAX_CELLS])
+def test_unique_houses_matches_part1(monkeypatch, bitmap_max_cells):
+    monkeypatch.setattr(day03, "BITMAP_MAX_CELLS", bitmap_max_cells)
+    moves = bytes(
+        np.random.default_rng(4).choice(list(b"^v<>\n"), 5000).astype(np.uint8)
+    )
+    assert unique_houses(moves) == part1(moves.decode())
+
+
+def test_unique_houses_with_agents():
+    assert unique_houses("^v", agents=2) == 3
+    assert unique_houses("^>v<", agents=2) == 3
+    assert unique_houses("^v^v^v^v^v", agents=2) == 11
+    moves = (
+        bytes(np.random.default_rng(5).choice(list(b"^v<>"), 5000).astype(np.uint8))
+        + b"\n"
+    )
+    assert unique_houses(moves, agents=2) == part2(moves.decode().strip())
+    assert unique_houses(b"^\n>", agents=2) == 3
+
+
+@pytest.mark.parametrize("agents", [1, 3, 7, 64])
+def test_unique_houses_round_robin(agents):
+    moves = np.random.default_rng(agents).choice(list("^v<>"), 1000)
+    positions = [(0, 0)] * agents
+    visited = {(0, 0)}
+    for turn, move in enumerate(moves):
+        x, y = positions[turn % agents]
+        x += (move == ">") - (move == "<")
+        y += (move == "^") - (move == "v")
+        positions[turn % agents] = (x, y)
+        visited.add((x, y))
+    assert unique_houses("".join(moves), agents=agents) == len(visited)
+
+
+@pytest.mark.parametrize("agents", [0, -1])
+def test_unique_houses_needs_an_agent(agents):
+    with pytest.raises(ValueError):
+        unique_houses("^v", agents=agents)
+
+
+@pytest.mark.parametrize("agents", [1, 2, 5])
+def test_unique_houses_in_chunks(agents):
+    moves = bytes(
+        np.random.default_rng(8).choice(list(b"^v<>\n"), 3000).astype(np.uint8)
+    )
+    expected = unique_houses(moves, agents)
+    for chunk_size in [1, 7, 64, 1000]:
+        assert unique_houses(moves, agents, chunk_size=chunk_size) == expected
+
+
+def _peak_memory(func, *args):
+    tracemalloc.start()
+    try:
+        func(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+@pytest.mark.parametrize(
+    "bitmap_max_cells, factor", [(day03.BITMAP_MAX_CELLS, 8), (0, 4)]
+)
+def test_unique_houses_memory(monkeypatch, bitmap_max_cells, factor):
+    monkeypatch.setattr(day03, "BITMAP_MAX_CELLS", bitmap_max_cells)
+    moves = np.random.default_rng(9).choice(list(b"^v<>"), 10**6).astype(np.uint8)
+    moves = moves.tobytes()
+    assert factor * _peak_memory(unique_houses, moves) < _peak_memory(
+        part1, moves.decode()
+    )
@@ -0,0 +1,158 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from ctypes import c_longlong
+from hashlib import md5
+
+import pytest
+
+import day04
+from day04 import (
+    CHECKPOINTS_ENV,
+    load_checkpoints,
+    mine,
+    resume_point,
+    save_checkpoint,
+    search,
+    threshold,
+)
+
+
+def brute_force(prefix, difficulty):
+    suffix = 0
+    while (
+        not md5(f"{prefix}{suffix}".encode()).hexdigest().startswith("0" * difficulty)
+    ):
+        suffix += 1
+    return suffix
+
+
+def test_search():
+    assert search("abcdef", 5, 609000, 610000) == 609043
+    assert search("abcdef", 5, 0, 1000) is None
+    assert search("abcdef", 5, 609043, 609044) == 609043
+
+
+def test_search_stops_beyond_the_match_found(monkeypatch):
+    # As in a worker of mine after another block found 5: only the first batch
+    # can hold a smaller match, the rest of the block is skipped
+    monkeypatch.setattr(day04, "_found", c_longlong(5))
+    assert search("abcdef", 5, 0, 10**12) is None
+    assert search("abcdef", 5, 609000, 610000) is None
+
+
+def test_threshold():
+    assert threshold(1) == b"\x10" + bytes(15)
+    assert threshold(5) == bytes(2) + b"\x10" + bytes(13)
+    assert bytes.fromhex("00000f" + "ff" * 13) < threshold(5)
+    assert bytes.fromhex("000010" + "00" * 13) >= threshold(5)
+    with pytest.raises(ValueError):
+        threshold(0)
+
+
+@pytest.mark.parametrize("prefix", ["abcdef", "pqrstuv", "iwrupvqb"])
+def test_mine_finds_smallest_suffix(prefix):
+    assert mine(prefix, 4, jobs=3, block_size=1000) == brute_force(prefix, 4)
+    expected = search(prefix, 3, 5000, 10**6)
+    assert mine(prefix, 3, start=5000, jobs=2, block_size=37) == expected
+
+
+def test_checkpoints(tmp_path, monkeypatch):
+    monkeypatch.setenv(CHECKPOINTS_ENV, str(tmp_path / "checkpoints.json"))
+    assert resume_point("abcdef", 5) == 0
+    save_checkpoint("abcdef", 3, 1000)
+    save_checkpoint("abcdef", 3, 500)
+    save_checkpoint("abcdef", 5, 700)
+    assert load_checkpoints() == {"abcdef:3": 1000, "abcdef:5": 700}
+    assert resume_point("abcdef", 2) == 0
+    assert resume_point("abcdef", 5) == 1000
+    assert resume_point("pqrstuv", 5) == 0
+
+
+def test_concurrent_checkpoints(tmp_path, monkeypatch):
+    monkeypatch.setenv(CHECKPOINTS_ENV, str(tmp_path / "checkpoints.json"))
+    with ProcessPoolExecutor(max_workers=4) as pool:
+        saves = [
+            pool.submit(save_checkpoint, "abcdef", difficulty, searched)
+            for searched in range(1, 301)
+            for difficulty in (5, 6)
+        ]
+        for save in saves:
+            save.result()
+    # Saves are serialised, so none of them gets lost
+    assert load_checkpoints() == {"abcdef:5": 300, "abcdef:6": 300}
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "checkpoints.json",
+        "checkpoints.json.lock",
+    ]
+
+    # A corrupt file counts as no checkpoints at all
+    (tmp_path / "checkpoints.json").write_text('{"abcdef:5": 1')
+    assert load_checkpoints() == {}
+    save_checkpoint("abcdef", 5, 100)
+    assert load_checkpoints() == {"abcdef:5": 100}
+
+
+def test_checkpoint_file_permissions(tmp_path, monkeypatch):
+    path = tmp_path / "checkpoints.json"
+    monkeypatch.setenv(CHECKPOINTS_ENV, str(path))
+    umask = os.umask(0o022)
+    try:
+        save_checkpoint("abcdef", 5, 100)
+    finally:
+        os.umask(umask)
+    assert path.stat().st_mode & 0o777 == 0o644
+
+
+def test_mine_resumes_from_checkpoint(tmp_path, monkeypatch):
+    monkeypatch.setenv(CHECKPOINTS_ENV, str(tmp_path / "checkpoints.json"))
+    expected = brute_force("abcdef", 4)
+    assert mine("abcdef", 4, jobs=2, block_size=500, checkpoints=True) == expected
+    assert resume_point("abcdef", 4) == expected
+    assert resume_point("abcdef", 5) == expected
+
+    reports = []
+    assert (
+        mine(
+            "abcdef",
+            4,
+            jobs=2,
+            block_size=500,
+            checkpoints=True,
+            progress=reports.append,
+        )
+        == expected
+    )
+    # Resumed at the answer, rather than searching everything below it again
+    assert reports[-1].searched == expected
+    assert reports[-1].hashes < expected // 2
+    assert all(report.hashes_per_second >= 0 for report in reports)
+
+
+def test_interrupted_search_keeps_its_progress(tmp_path, monkeypatch):
+    monkeypatch.setenv(CHECKPOINTS_ENV, str(tmp_path / "checkpoints.json"))
+    monkeypatch.setattr(day04, "CHECKPOINT_INTERVAL", 0)
+
+    reports = []
+
+    def interrupt(progress):
+        reports.append(progress)
+        if progress.searched >= 2000:
+            raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        mine("abcdef", 6, jobs=1, block_size=500, checkpoints=True, progress=interrupt)
+    assert resume_point("abcdef", 6) == reports[-1].searched >= 2000
+
+
+def test_search_from_a_later_start_saves_no_checkpoint(tmp_path, monkeypatch):
+    monkeypatch.setenv(CHECKPOINTS_ENV, str(tmp_path / "checkpoints.json"))
+    expected = brute_force("abcdef", 4)
+    later = mine("abcdef", 4, start=40000, jobs=2, block_size=500, checkpoints=True)
+    assert later > expected
+    assert load_checkpoints() == {}
+    assert mine("abcdef", 4, jobs=2, block_size=500, checkpoints=True) == expected
+
+    # Starting at or before the checkpoint still extends it
+    save_checkpoint("abcdef", 5, 1000)
+    mine("abcdef", 5, start=500, jobs=2, block_size=500, checkpoints=True)
+    assert resume_point("abcdef", 5) == brute_force("abcdef", 5)
@@ -0,0 +1,61 @@
+import random
+from time import perf_counter
+
+import pytest
+
+from day05 import classify, count_nice, is_nice_string, is_nice_string_part2
+from utils.generators import generate
+
+
+@pytest.mark.parametrize(
+    "s, nice",
+    [
+        ("ugknbfddgicrmopn", (True, False)),
+        ("aaa", (True, False)),
+        ("jchzalrnumimnmhp", (False, False)),
+        ("haegwjzuvuyypxyu", (False, False)),
+        ("dvszwmarrgswjxmb", (False, False)),
+        ("qjhvhtzxzqqjkmpb", (False, True)),
+        ("xxyxx", (False, True)),
+        ("uurcxstgmygtbstg", (False, False)),
+        ("ieodomkazucvgmuy", (False, False)),
+        ("aaaa", (True, True)),
+        ("", (False, False)),
+    ],
+)
+def test_classify(s, nice):
+    assert classify(s) == nice
+
+
+def test_classify_matches_rules():
+    rng = random.Random(5)
+    strings = [
+        "".join(rng.choices("abcdepqxy", k=rng.randint(0, 40))) for _ in range(2000)
+    ]
+    for s in strings:
+        assert classify(s) == (is_nice_string(s), is_nice_string_part2(s)), s
+    expected = (
+        sum(map(is_nice_string, strings)),
+        sum(map(is_nice_string_part2, strings)),
+    )
+    assert count_nice("\n".join(strings)) == expected
+    assert count_nice("".join(f"{s}\r\n" for s in strings)) == expected
+
+
+def test_count_nice_is_faster_than_classifying_one_by_one():
+    strings = generate(5, 20_000).splitlines()
+    text = "\n".join(strings)
+
+    def classify_all():
+        return tuple(map(sum, zip(*map(classify, strings))))
+
+    def best_time(func):
+        times = []
+        for _ in range(3):
+            start = perf_counter()
+            func()
+            times.append(perf_counter() - start)
+        return min(times)
+
+    assert count_nice(text) == classify_all()
+    assert 2 * best_time(lambda: count_nice(text)) < best_time(classify_all)
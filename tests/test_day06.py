@@ -0,0 +1,141 @@
+import random
+
+import numpy as np
+import pytest
+
+from day06 import (
+    ACTIONS,
+    DIM,
+    SWITCH,
+    TOGGLE,
+    TURN_OFF,
+    TURN_ON,
+    LightTree,
+    parse,
+    run_lights,
+)
+
+
+def random_instructions(rng, count, size):
+    lines = []
+    for _ in range(count):
+        x0, x1 = sorted(rng.randrange(size) for _ in range(2))
+        y0, y1 = sorted(rng.randrange(size) for _ in range(2))
+        lines.append(f"{rng.choice(ACTIONS)} {x0},{y0} through {x1},{y1}")
+    return parse(lines)
+
+
+def test_parse():
+    instructions = parse(
+        [
+            "turn on 0,0 through 999,999",
+            "toggle 0,0 through 999,0",
+            "turn off 499,499 through 500,500\n",
+        ]
+    )
+    assert instructions["action"].tolist() == [TURN_ON, TOGGLE, TURN_OFF]
+    assert instructions[2].tolist() == (TURN_OFF, 499, 499, 500, 500)
+    assert len(parse([])) == 0
+
+
+@pytest.mark.parametrize(
+    "line, message",
+    [
+        ("turn 0,0 through 1,1", "Line 2: not an instruction"),
+        ("toggle 0,0 through 1", "Line 2: not an instruction"),
+        ("toggle 5,0 through 1,1", "Line 2: corners out of order"),
+    ],
+)
+def test_parse_reports_bad_lines(line, message):
+    with pytest.raises(ValueError, match=message):
+        parse(["toggle 0,0 through 1,1", line])
+
+
+def follow(instructions, size):
+    """Light by light, as the puzzle describes it"""
+    on, brightness = set(), {}
+    for action, x0, y0, x1, y1 in instructions.tolist():
+        for x in range(x0, x1 + 1):
+            for y in range(y0, y1 + 1):
+                if action == TURN_ON:
+                    on.add((x, y))
+                    brightness[x, y] = brightness.get((x, y), 0) + 1
+                elif action == TURN_OFF:
+                    on.discard((x, y))
+                    brightness[x, y] = max(0, brightness.get((x, y), 0) - 1)
+                else:
+                    on ^= {(x, y)}
+                    brightness[x, y] = brightness.get((x, y), 0) + 2
+    return len(on), sum(brightness.values())
+
+
+@pytest.mark.parametrize("compressed", [False, True])
+def test_run_lights(compressed):
+    rng = random.Random(6)
+    for _ in range(20):
+        instructions = random_instructions(rng, 15, 25)
+        expected = follow(instructions, 25)
+        assert (
+            run_lights(instructions, size=25, compressed=compressed),
+            run_lights(instructions, True, size=25, compressed=compressed),
+        ) == expected
+
+
+@pytest.mark.parametrize("compressed", [False, True])
+def test_run_lights_rejects_rectangles_off_the_grid(compressed):
+    instructions = parse(["turn on 990,990 through 1010,1010"])
+    with pytest.raises(ValueError, match="does not fit"):
+        run_lights(instructions, compressed=compressed)
+    assert run_lights(parse(["turn on 990,990 through 999,999"])) == 100
+
+
+def test_compressed_scales_with_instructions():
+    instructions = parse(
+        [
+            "turn on 0,0 through 999999,999999",
+            "toggle 10,20 through 500009,20",
+            "turn off 499999,0 through 999999,999999",
+        ]
+    )
+    assert run_lights(instructions, size=10**6, compressed=True) == (
+        499_999 * 10**6 - 499_989
+    )
+    assert run_lights(instructions, True, size=10**6, compressed=True) == (
+        10**12 + 2 * 500_000 - 500_001 * 10**6
+    )
+
+
+@pytest.mark.parametrize("updates", [SWITCH, DIM], ids=["switch", "dim"])
+def test_clamp_then(updates):
+    clamps = list(updates)
+    for first in clamps:
+        for second in clamps:
+            for third in clamps:
+                combined = first.then(second).then(third)
+                for value in range(5):
+                    assert combined(value) == third(second(first(value)))
+                    assert type(combined(value)) is int
+
+
+@pytest.mark.parametrize("brightness", [False, True])
+def test_light_tree_queries_between_instructions(brightness):
+    rng = random.Random(7)
+    size = 37
+    tree = LightTree(size, brightness)
+    lights = np.zeros((size, size), dtype=np.int64)
+    for action, x0, y0, x1, y1 in random_instructions(rng, 60, size).tolist():
+        tree.apply(action, (x0, y0), (x1, y1))
+        region = lights[x0 : x1 + 1, y0 : y1 + 1]
+        if action == TURN_ON:
+            region[...] = region + 1 if brightness else 1
+        elif action == TURN_OFF:
+            region[...] = np.maximum(region - 1, 0) if brightness else 0
+        else:
+            region[...] = region + 2 if brightness else 1 - region
+        for _ in range(3):
+            (qx0, qy0, qx1, qy1) = (rng.randrange(size) for _ in range(4))
+            qx0, qx1 = sorted((qx0, qx1))
+            qy0, qy1 = sorted((qy0, qy1))
+            expected = lights[qx0 : qx1 + 1, qy0 : qy1 + 1].sum()
+            assert tree.query((qx0, qy0), (qx1, qy1)) == expected
+        assert tree.query() == lights.sum()
@@ -0,0 +1,91 @@
+import pytest
+
+from day07 import MASK, Circuit, parse, solve_part1, solve_part2
+
+EXAMPLE = {
+    "d": 72,
+    "e": 507,
+    "f": 492,
+    "g": 114,
+    "h": 65412,
+    "i": 65079,
+    "x": 123,
+    "y": 456,
+}
+
+
+def test_example():
+    circuit = Circuit(parse("test_day07.txt"))
+    for wire, expected in EXAMPLE.items():
+        assert circuit.get_wire(wire) == expected
+
+
+def test_deep_circuit():
+    # Far deeper than the recursion limit, listed back to front
+    depth = 200_000
+    instructions = {f"w{i}": f"NOT w{i - 1}" for i in range(1, depth)}
+    instructions = dict(reversed(instructions.items()))
+    instructions["w0"] = "12345"
+    assert Circuit(instructions).get_wire(f"w{depth - 1}") == (~12345 & 0xFFFF)
+
+
+def test_constants_stay_in_16_bits():
+    circuit = Circuit({"a": "70000", "b": "a OR 65536", "c": "1 LSHIFT 16"})
+    assert [circuit.get_wire(wire) for wire in "abc"] == [70000 & 0xFFFF] * 2 + [0]
+
+
+@pytest.mark.parametrize(
+    "instructions, message",
+    [
+        ({"a": "b AND c", "b": "1"}, "No instruction found for wire c"),
+        ({"a": "b", "b": "NOT a"}, "loop"),
+        ({"a": "1 XOR 2"}, "Unknown operator"),
+        ({"a": "AND 1"}, "Unknown single operator"),
+    ],
+)
+def test_bad_circuits(instructions, message):
+    with pytest.raises(ValueError, match=message):
+        Circuit(instructions)
+
+
+def test_set_wire():
+    circuit = Circuit(parse("test_day07.txt"))
+    circuit.set_wire("x", 0)
+    assert [circuit.get_wire(wire) for wire in "defghixy"] == [
+        0,
+        456,
+        0,
+        114,
+        MASK,
+        65079,
+        0,
+        456,
+    ]
+    circuit.set_wire("d", 7)
+    assert circuit.get_wire("d") == 7
+
+
+@pytest.mark.parametrize("value", [-1, MASK + 1])
+def test_set_wire_rejects_signals_outside_16_bits(value):
+    circuit = Circuit(parse("test_day07.txt"))
+    with pytest.raises(ValueError):
+        circuit.set_wire("d", value)
+    assert circuit.get_wire("d") == 72
+
+
+def test_set_wire_matches_recompiling():
+    instructions = {"b": "3", "c": "b LSHIFT 2", "d": "NOT b", "e": "c OR d"}
+    for i in range(5, 200):
+        instructions[f"w{i}"] = f"w{i - 1} RSHIFT 1" if i % 3 else f"b AND w{i - 1}"
+        if i == 5:
+            instructions["w4"] = "e"
+    circuit = Circuit(instructions)
+    for value in [0, 1, 12345, MASK, 3, 3]:
+        circuit.set_wire("b", value)
+        expected = Circuit({**instructions, "b": str(value)})
+        assert circuit.values == expected.values
+
+
+def test_solutions():
+    assert solve_part1("day07.txt") == 46065
+    assert solve_part2("day07.txt") == 14134
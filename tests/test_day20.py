@@ -1,4 +1,6 @@
-from day20 import presents
+import pytest
+
+from day20 import first_house, limited_presents, presents
 
 
 def test_presents():
@@ -11,3 +13,11 @@ def test_presents():
     assert presents(7) == 80
     assert presents(8) == 150
     assert presents(9) == 130
+
+
+def test_first_house():
+    assert first_house(presents, 70) == 4
+    assert first_house(presents, 120) == 6
+    assert first_house(limited_presents, 11 * 12) == 6
+    with pytest.raises(ValueError):
+        first_house(presents, 10**6, limit=100)
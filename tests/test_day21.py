@@ -5,10 +5,12 @@ from day21 import (
     calculate_stats,
     part1,
     part2,
+    parse_boss_stats,
     WEAPONS,
     ARMOR,
     RINGS,
 )
+from utils.file_utils import DATA_DIR_ENV
 
 
 def test_character_creation():
@@ -100,3 +102,10 @@ def test_part2_with_strong_boss():
 
     # Should be able to lose with the most expensive equipment
     assert max_cost > 0
+
+
+def test_parse_boss_stats_skips_blank_lines(tmp_path, monkeypatch):
+    """Test that blank lines around the stats are ignored."""
+    monkeypatch.setenv(DATA_DIR_ENV, str(tmp_path))
+    (tmp_path / "day21.txt").write_text("Hit Points: 104\nDamage: 8\nArmor: 1\n\n")
+    assert parse_boss_stats() == (104, 8, 1)
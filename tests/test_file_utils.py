@@ -1,3 +1,7 @@
+import os
+
+import pytest
+
 import utils.file_utils as u
 
 
@@ -35,3 +39,103 @@ def test_read_file_g_convert():
     assert len(lines) == 6
     assert lines[0] == 1
     assert lines[1] == -2
+
+
+def test_map_file():
+    with u.map_file("test-utils.txt", convert=u.toint) as lines:
+        assert len(lines) == 6
+        assert lines[0] == 1
+        assert lines[-1] == -6
+        assert lines[1:3] == [-2, 3]
+        assert list(lines) == u.read_file("test-utils.txt", convert=u.toint)
+
+
+def test_map_file_blank_lines_and_separator(tmp_path):
+    (tmp_path / "input.txt").write_text("1,2\n\n3,4")
+    with u.map_file("input.txt", str(tmp_path), separator=",") as lines:
+        assert list(lines) == [["1", "2"], [""], ["3", "4"]]
+        assert list(lines.fields()) == ["1", "2", "", "3", "4"]
+    assert u.read_file("input.txt", str(tmp_path), separator=",") == [
+        "1",
+        "2",
+        "",
+        "3",
+        "4",
+    ]
+
+
+def test_map_file_empty(tmp_path):
+    (tmp_path / "empty.txt").write_text("")
+    with u.map_file("empty.txt", str(tmp_path)) as lines:
+        assert len(lines) == 0
+
+
+@pytest.mark.parametrize(
+    "text", ["\n", "a", "a\n", "\n\nb\n\n", "one\ntwo\n\nthree", "x\n" * 1000]
+)
+@pytest.mark.parametrize("chunk_size", [1, 3, u.READ_CHUNK_SIZE])
+def test_map_file_lines_match_readlines(tmp_path, monkeypatch, text, chunk_size):
+    monkeypatch.setattr(u, "READ_CHUNK_SIZE", chunk_size)
+    (tmp_path / "input.txt").write_text(text)
+    with open(tmp_path / "input.txt") as f:
+        expected = [line.strip() for line in f.readlines()]
+    with u.map_file("input.txt", str(tmp_path)) as lines:
+        assert list(lines) == expected
+        assert lines[:] == expected
+
+
+def test_data_directory_from_environment(tmp_path, monkeypatch):
+    (tmp_path / "input.txt").write_text("42\n")
+    monkeypatch.setenv(u.DATA_DIR_ENV, str(tmp_path))
+    assert u.data_directory() == str(tmp_path)
+    assert u.read_file("input.txt", convert=u.toint) == [42]
+
+
+def test_project_root_outside_a_checkout(tmp_path, monkeypatch):
+    assert u.project_root() == u.PROJECT_ROOT
+    assert (u.PROJECT_ROOT / "pyproject.toml").is_file()
+    module = tmp_path / "lib" / "site-packages" / "utils" / "file_utils.py"
+    monkeypatch.chdir(tmp_path)
+    assert u.project_root(module) == tmp_path
+
+
+def test_read_file_cache(tmp_path):
+    path = tmp_path / "input.txt"
+    path.write_text("a\nb\n")
+    u.clear_input_cache()
+    first = u.read_file("input.txt", str(tmp_path))
+    first.pop()
+    assert u.read_file("input.txt", str(tmp_path)) == ["a", "b"]
+    assert u._cached_file.cache_info().hits == 1
+
+    path.write_text("c\n")
+    os.utime(path, ns=(1, 1))  # make sure the modification time changes
+    assert u.read_file("input.txt", str(tmp_path)) == ["c"]
+    assert u.read_raw_file("input.txt", str(tmp_path)) == "c\n"
+
+
+def test_large_inputs_are_not_cached(tmp_path, monkeypatch):
+    monkeypatch.setattr(u, "INPUT_CACHE_MAX_FILE_SIZE", 4)
+    (tmp_path / "small.txt").write_text("a\n")
+    (tmp_path / "large.txt").write_text("a\nb\nc\n")
+    u.clear_input_cache()
+    for _ in range(2):
+        assert u.read_file("small.txt", str(tmp_path)) == ["a"]
+        assert u.read_file("large.txt", str(tmp_path)) == ["a", "b", "c"]
+        assert u.read_raw_file("large.txt", str(tmp_path)) == "a\nb\nc\n"
+    assert u._cached_file.cache_info().currsize == 1
+    assert u._cached_raw_file.cache_info().currsize == 0
+
+
+def test_read_file_g_reads_past_blank_lines(tmp_path):
+    (tmp_path / "input.txt").write_text("a => b\n\nmolecule\n")
+    lines = list(u.read_file_g("input.txt", str(tmp_path), chunk_size=3))
+    assert lines == ["a => b", "", "molecule"]
+
+
+def test_read_file_g_batches(tmp_path):
+    (tmp_path / "input.txt").write_text("1x2\n3x4\n5x6")
+    g = u.read_file_g(
+        "input.txt", str(tmp_path), separator="x", convert=u.toint, batch_size=2
+    )
+    assert list(g) == [([1, 2], [3, 4]), ([5, 6],)]
@@ -0,0 +1,65 @@
+import json
+import re
+import tracemalloc
+
+import pytest
+
+import utils.generators as g
+from utils.file_utils import DATA_DIR_ENV
+
+
+def test_every_day_has_a_generator():
+    assert sorted(g.GENERATORS) == list(range(1, 26))
+
+
+def test_generate_is_deterministic():
+    assert g.generate(3, 100, seed=1) == g.generate(3, 100, seed=1)
+    assert g.generate(3, 100, seed=1) != g.generate(3, 100, seed=2)
+    assert len(g.generate(3, 100)) == 100
+
+
+def test_generated_inputs_parse(tmp_path, monkeypatch):
+    monkeypatch.setenv(DATA_DIR_ENV, str(tmp_path))
+    from day07 import solve_part1
+    from day09 import parse
+    from day24 import best_first_group_min_qe_groups
+
+    g.write_input(7, str(tmp_path), 200)
+    assert 0 <= solve_part1("day07.txt") < 1 << 16
+
+    g.write_input(9, str(tmp_path), 20)
+    assert len(parse("day09.txt")) == 20 * 19
+
+    weights = [int(w) for w in g.generate(24, 24).split()]
+    assert len(set(weights)) == len(weights) >= 24
+    assert best_first_group_min_qe_groups(weights, groups=4) is not None
+
+    json.loads(g.generate(12, 1000))
+
+
+def test_symbols_take_a_byte_each():
+    tracemalloc.start()
+    try:
+        assert len(g.generate(3, 10**6)) == 10**6
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    assert peak < 4 * 10**6
+
+
+def test_main_passes_options_on(tmp_path, capsys):
+    g.main(["6", "--size", "50", "--option", "grid_size=10", "-o", str(tmp_path)])
+    assert capsys.readouterr().out.strip() == str(tmp_path / "day06.txt")
+    lines = (tmp_path / "day06.txt").read_text().splitlines()
+    corners = [int(c) for line in lines for c in re.findall(r"\d+", line)]
+    assert len(lines) == 50 and max(corners) < 10
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [["6", "9", "--option", "grid_size=100"], ["6", "--option", "size=3"], ["26"]],
+)
+def test_main_rejects_bad_days_and_options_up_front(tmp_path, argv):
+    with pytest.raises(SystemExit):
+        g.main([*argv, "-o", str(tmp_path)])
+    assert list(tmp_path.iterdir()) == []
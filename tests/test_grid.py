@@ -0,0 +1,33 @@
+import numpy as np
+
+import utils.aoc_utils as au
+import utils.grid as g
+
+
+def test_neighbour_counts_match_neighbours():
+    rng = np.random.default_rng(2015)
+    cells = rng.random((7, 9)) < 0.5
+    for include_diagonals in (False, True):
+        counts = g.neighbour_counts(cells, include_diagonals)
+        for r in range(7):
+            for c in range(9):
+                expected = sum(
+                    cells[nr, nc]
+                    for nr, nc in au.neighbours(r, c, 7, 9, include_diagonals)
+                )
+                assert counts[r, c] == expected
+
+
+def test_neighbour_counts_toroidal():
+    cells = np.zeros((4, 4), dtype=np.bool_)
+    cells[0, 0] = True
+    counts = g.neighbour_counts(cells, include_diagonals=True, edges=g.TOROIDAL)
+    assert counts[3, 3] == counts[0, 3] == counts[3, 0] == 1
+    assert counts.sum() == 8
+
+
+def test_grid_from_lines():
+    grid = g.Grid.from_lines([".#.", "##."])
+    assert grid.shape == (2, 3)
+    assert grid.count() == 3
+    assert grid.to_lines() == [".#.", "##."]
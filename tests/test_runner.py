@@ -0,0 +1,105 @@
+import json
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import utils.runner as r
+from utils.registry import SOLUTIONS, discover, solution
+
+
+def test_discover():
+    assert discover([2, 18], parts=[1]) == [(2, 1), (18, 1)]
+    assert (2, 2) in SOLUTIONS
+
+
+def test_parse_days():
+    assert r.parse_days(["3", "5-7"]) == [3, 5, 6, 7]
+
+
+def test_run_part():
+    discover([21])
+    result = r.run_part(21, 1, trace_memory=True)
+    assert result.answer == 91
+    assert result.error is None
+    assert result.wall_time > 0
+    assert result.peak_memory_kb >= 0
+
+
+def _spin(seconds):
+    end = time.process_time() + seconds
+    while time.process_time() < end:
+        pass
+
+
+def test_run_part_measures_each_part():
+    @solution(98, 1)
+    def big():
+        return len(bytearray(200 * 1024 * 1024))
+
+    @solution(98, 2)
+    def in_child():
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            pool.submit(_spin, 0.3).result()
+
+    try:
+        first = r.run_part(98, 1)
+        second = r.run_part(98, 2)
+    finally:
+        del SOLUTIONS[(98, 1)], SOLUTIONS[(98, 2)]
+    assert first.peak_memory_kb > 200 * 1024
+    if sys.platform == "linux":
+        assert second.peak_memory_kb < first.peak_memory_kb - 100 * 1024
+    assert second.cpu_time >= 0.25
+
+
+def test_run_part_timeout():
+    @solution(99, 1)
+    def sleepy():
+        time.sleep(5)
+
+    try:
+        result = r.run_part(99, 1, timeout=0.05)
+    finally:
+        del SOLUTIONS[(99, 1)]
+    assert result.error == "TimeoutError: time limit exceeded"
+    assert result.wall_time < 1
+
+
+def test_run_parallel_keeps_task_order(tmp_path, monkeypatch):
+    timings = tmp_path / "timings.json"
+    timings.write_text(json.dumps({"21.1": 0.1, "21.2": 9.0}))
+    monkeypatch.setenv(r.TIMINGS_ENV, str(timings))
+    results = r.run([21, 2], jobs=2)
+    assert [(res.day, res.part) for res in results] == [
+        (2, 1),
+        (2, 2),
+        (21, 1),
+        (21, 2),
+    ]
+    assert [res.answer for res in results[2:]] == [91, 158]
+
+
+def test_main_json(capsys, tmp_path, monkeypatch):
+    monkeypatch.setenv(r.TIMINGS_ENV, str(tmp_path / "timings.json"))
+    assert r.main(["21", "-p", "2", "--json"]) == 0
+    results = json.loads(capsys.readouterr().out)
+    assert [(res["day"], res["part"], res["answer"]) for res in results] == [
+        (21, 2, 158)
+    ]
+    assert list(r.load_timings()) == ["21.2"]
+
+
+def test_main_reports_when_timings_cannot_be_written(capsys, tmp_path, monkeypatch):
+    monkeypatch.setenv(r.TIMINGS_ENV, str(tmp_path / "missing" / "timings.json"))
+    assert r.main(["21", "-p", "2"]) == 0
+    out, err = capsys.readouterr()
+    assert out.startswith("Day 21 part 2: 158 ")
+    assert "could not record timings" in err
+
+
+def test_run_part_profiled(tmp_path):
+    discover([21])
+    for mode, suffix in [("cprofile", "pstats"), ("sample", "collapsed")]:
+        result = r.run_part(21, 1, profile=mode, profile_dir=str(tmp_path), top=3)
+        assert result.answer == 91
+        assert (tmp_path / f"day21-part1.{suffix}").exists()